@@ -0,0 +1,131 @@
+# tests/test_matcher.py
+# ─────────────────────────────────────────────────────────────
+# Blocked / incremental matcher against the all-pairs reference
+# ─────────────────────────────────────────────────────────────
+import random
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from utils.matcher import (
+    MATCH_THRESHOLD, SITE_ORDER, blocking_keys, match_blocked, match_exhaustive, normalize_name,
+)
+
+BRANDS = ["Lakme", "Maybelline", "Nykaa", "Sugar", "Lakmé", "MAC", "Swiss Beauty", "Insight"]
+WORDS = ["matte", "lipstick", "lipsticks", "liquid", "foundation", "blush", "fit", "me", "128", "warm",
+         "nude", "red", "pink", "gel", "compact", "powder", "kajal", "9to5", "primer", "creme", "cream",
+         "lip", "color", "colour", "velvet", "long", "lasting", "waterproof", "spf", "15", "30ml", "4g"]
+
+
+def group_names(groups):
+    return [{site: (p["name"] if p else None) for site, p in group.items()} for group in groups]
+
+
+def product_like_sites(seed):
+    """Listings of shared products with per-site suffixes and dropped letters, plus site-only extras."""
+    r = random.Random(seed)
+    base = []
+    for _ in range(r.randint(0, 60)):
+        brand = r.choice(BRANDS)
+        name = " ".join(r.choice(WORDS) for _ in range(r.randint(0, 6)))
+        base.append({"brand": brand, "name": f"{brand} {name}" if r.random() < 0.5 else name, "price": "1"})
+
+    sites = []
+    for site in SITE_ORDER:
+        products = []
+        for p in base:
+            if r.random() < 0.7:
+                q = dict(p)
+                if r.random() < 0.3:
+                    q["name"] += " " + r.choice(WORDS)
+                if r.random() < 0.2:
+                    q["name"] = q["name"].replace("a", "", 1)
+                products.append(q)
+        sites.append((site, products))
+    return sites
+
+
+def random_letter_sites(seed):
+    r = random.Random(seed)
+    name = lambda: " ".join(
+        "".join(r.choice("abcfghj") for _ in range(r.randint(1, 6))) for _ in range(r.randint(1, 3))
+    )
+    return [(site, [{"name": name(), "price": "1"} for _ in range(r.randint(0, 6))]) for site in SITE_ORDER]
+
+
+def missed_pairs(sites):
+    """Pairs above the threshold that share no blocking key."""
+    names = {normalize_name(p["name"]) for _, products in sites for p in products}
+    return [
+        (a, b) for a, b in combinations(sorted(names), 2)
+        if SequenceMatcher(None, a, b).ratio() > MATCH_THRESHOLD and not blocking_keys(a) & blocking_keys(b)
+    ]
+
+
+def test_short_names_with_scattered_overlap_are_grouped():
+    # ratio 0.706, no common token — only the shared short-name bucket brings them together
+    sites = [("myntra", [{"name": "cafgf bj", "price": "1"}]), ("nykaa", [{"name": "ccaffb bh", "price": "1"}])]
+    assert group_names(match_blocked(sites)) == group_names(match_exhaustive(sites))
+    assert len(match_blocked(sites)) == 1
+
+
+def test_blocked_equals_exhaustive_on_product_names():
+    for seed in range(100):
+        sites = product_like_sites(seed)
+        assert group_names(match_blocked(sites)) == group_names(match_exhaustive(sites)), seed
+
+
+def test_short_pairs_always_share_a_key():
+    for seed in range(3000):
+        for a, b in missed_pairs(random_letter_sites(seed)):
+            assert len(a) + len(b) > 17, (seed, a, b)
+
+
+def test_blocked_differs_from_exhaustive_only_through_documented_misses():
+    # Random letters split into words arbitrarily — the known blocking gap for longer names
+    for seed in range(3000):
+        sites = random_letter_sites(seed)
+        if group_names(match_blocked(sites)) != group_names(match_exhaustive(sites)):
+            assert missed_pairs(sites), seed
+
+
+def test_catalog_repeat_search_returns_the_same_groups(tmp_path):
+    from utils.catalog import ProductCatalog
+    from utils.matcher import match_with_catalog
+    from utils.product import Product
+
+    from tools.bench_matching import LISTING_URLS
+
+    for seed in range(20):
+        sites = [
+            (site, [Product.create(site, p["name"], p["price"], link=LISTING_URLS[site].format(i=i), brand=p["brand"])
+                    for i, p in enumerate(products)])
+            for site, products in product_like_sites(seed)
+        ]
+        catalog = ProductCatalog(str(tmp_path / f"catalog-{seed}.db"))
+        runs = [group_names(match_with_catalog(sites, catalog)) for _ in range(3)]
+        assert runs[0] == group_names(match_blocked(sites)), seed
+        assert runs[1] == runs[0] and runs[2] == runs[0], seed
+
+
+def test_catalog_forgets_stale_and_invalidated_listings(tmp_path):
+    from utils.catalog import ProductCatalog
+    from utils.product import Product
+
+    from tools.bench_matching import LISTING_URLS
+
+    group = {site: Product.create(site, "Lakme 9to5 primer", "1", link=LISTING_URLS[site].format(i=1))
+             for site in ("myntra", "nykaa")}
+    members = list(group.values())
+
+    catalog = ProductCatalog(str(tmp_path / "catalog.db"), ttl=3600)
+    catalog.record_groups([group])
+    assert len(catalog.resolve_many(members)) == 2
+
+    catalog.invalidate([group["myntra"].id])
+    assert set(catalog.resolve_many(members)) == {group["nykaa"].id}
+
+    expired = ProductCatalog(str(tmp_path / "catalog.db"), ttl=-1)
+    assert expired.resolve_many(members) == {}
+    other = dict(group, nykaa=Product.create("nykaa", "Sugar kajal", "1", link=LISTING_URLS["nykaa"].format(i=2)))
+    expired.record_groups([other])
+    assert expired.stats()["pruned"] >= 1
@@ -0,0 +1,42 @@
+# tests/test_product.py
+# ─────────────────────────────────────────────────────────────
+# Product ids — one per listing, stable across searches
+# ─────────────────────────────────────────────────────────────
+from utils.product import Product, product_id
+
+
+def test_sponsored_amazon_results_keep_their_asin():
+    ad = "https://www.amazon.in/sspa/click?ie=UTF8&spc=MTo&url=%2F{}%2Fdp%2F{}%2Fref%3Dsr_1_1_sspa%3Fk%3Dlipstick"
+    first = product_id("amazon", ad.format("Lakme-Lipstick", "B07ABCDEF1"))
+    second = product_id("amazon", ad.format("Maybelline-Lip", "B09ZZZZZZ9"))
+    organic = product_id("amazon", "https://www.amazon.in/Lakme-Lipstick/dp/B07ABCDEF1/ref=sr_1_3?k=lipstick")
+    assert first != second
+    assert first == organic
+
+
+def test_amazon_rank_does_not_change_the_id():
+    assert product_id("amazon", "https://www.amazon.in/Lakme/dp/B07ABCDEF1/ref=sr_1_3") == \
+        product_id("amazon", "https://www.amazon.in/Lakme/dp/B07ABCDEF1/ref=sr_1_9?keywords=lakme")
+
+
+def test_flipkart_shades_differ_by_pid():
+    link = "https://www.flipkart.com/lakme-9-5-lipstick/p/itm6c9d1a2b3c4d5?pid={}&lid=LSTX&marketplace=FLIPKART"
+    assert product_id("flipkart", link.format("LSKFZ1")) != product_id("flipkart", link.format("LSKFZ2"))
+
+
+def test_nykaa_and_myntra_use_the_product_number():
+    assert product_id("nykaa", "https://www.nykaa.com/lakme-9to5/p/123456?productId=123456&pps=3") == \
+        product_id("nykaa", "https://www.nykaa.com/lakme-9to5-primer/p/123456?pps=8")
+    assert product_id("myntra", "https://www.myntra.com/lipstick/lakme/lakme-9to5/7654321/buy") == \
+        product_id("myntra", "https://www.myntra.com/lakme/7654321/buy?searchQuery=lipstick")
+
+
+def test_falls_back_to_the_name_without_a_site_id():
+    search_page = "https://www.flipkart.com/search?q=lipstick"
+    assert product_id("flipkart", search_page, "lakme lipstick") == product_id("flipkart", "", "lakme lipstick")
+    assert product_id("flipkart", search_page, "lakme lipstick") != product_id("flipkart", search_page, "sugar kohl")
+
+
+def test_round_trip_keeps_the_id():
+    p = Product.create("nykaa", "Lakme 9to5 Lipstick", "₹499", link="https://www.nykaa.com/x/p/42")
+    assert Product.from_dict(p.to_dict()).id == p.id
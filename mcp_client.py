@@ -1,185 +1,325 @@
-import os, json, time, traceback, subprocess
+import os, json, time, traceback, asyncio, threading
+import concurrent.futures
+from collections import OrderedDict
 from typing import Optional
 from contextlib import AsyncExitStack
 from dotenv import load_dotenv
 import requests
-from ollama import Client
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 from utils.logger import logger
+from tools.scraper import SITES, empty_results, cancel_sites
+from tools.scrape_service import get_scrape_service
+from utils.scrape_cache import get_scrape_cache, normalize_keyword
+from utils.single_flight import SingleFlight
+from utils.llm_cache import get_llm_cache
+from utils.ai_suggestor import generate_suggestions, parse_insights
+from utils.llm_gateway import BACKGROUND, get_llm_gateway
+from utils.model_manager import get_model_manager
+from utils.prompt_builder import build_prompt, prompt_stats, site_sections
+from utils.matcher import BLACKLIST, DEFAULT_BACKEND, IncrementalMatcher, normalize_name, match_products, match_with_catalog
+from utils.catalog import CATALOG_ENABLED, get_catalog
+from utils.relevance import rank_by_relevance
 from difflib import SequenceMatcher, get_close_matches
 
 load_dotenv()
 
-BLACKLIST = {
-    "black", "white", "red", "blue", "green", "pink", "purple", "orange", "yellow",
-    "xl", "l", "s", "m", "xxl", "hydrating", "refreshing", "glow", "classic",
-    "combo", "pack", "kit", "style", "for", "with", "set", "edition", "cream", "gel"
-}
+# End-to-end scrape budget per query in seconds; unfinished sites are dropped
+QUERY_DEADLINE = float(os.getenv("QUERY_DEADLINE", "30"))
 
-def normalize_name(name: str) -> str:
-    if not name:
-        return ""
-    words = name.lower().split()
-    return " ".join([w for w in words if w not in BLACKLIST])
+# Shared by every MCPClient in the process (one per Streamlit session) so that
+# concurrent searches for the same keyword share a single scrape
+_compare_flights = SingleFlight()
+
+# Search insights (summary + suggestions) run off the search path. The latest
+# future per keyword is kept so the UI / HTTP clients can collect it later.
+SUMMARY_WORKERS = int(os.getenv("SUMMARY_WORKERS", "2"))
+MAX_TRACKED_SUMMARIES = 128
+_summary_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SUMMARY_WORKERS, thread_name_prefix="summary")
+_insights = OrderedDict()
+_insights_lock = threading.Lock()
 
 
 class MCPClient:
     def __init__(self):
         self.exit_stack = AsyncExitStack()
         self.session: Optional[ClientSession] = None
-        self.llm = Client(host="http://localhost:11434")
-        self.model = "mistral"
+        self.llm = get_llm_gateway()
+        self.models = get_model_manager()
+        # Every entry point (FastAPI, Streamlit) builds a client — load the models in the background
+        self.models.start_preload()
         self.logger = logger
+        self.scraper = get_scrape_service()
+        self.cache = get_scrape_cache()
+        self.catalog = get_catalog() if CATALOG_ENABLED else None
+        self.llm_cache = get_llm_cache()
 
     # ─────────────────────────────────────────────
     # SCRAPER CALL
     # ─────────────────────────────────────────────
-    def scrape_combined_subprocess(self, keyword: str) -> dict:
+    def scrape_combined(self, keyword: str, deadline: Optional[float] = None):
+        """
+        Return ({site: products}, [timed-out sites]). `deadline` is the number
+        of seconds the scrape may take; sites still running then are cancelled
+        and reported as timed out while finished sites are kept.
+        """
+        deadline = QUERY_DEADLINE if deadline is None else deadline
+        fresh, stale = self.cache.lookup(keyword, SITES)
+        results = {**empty_results(), **stale, **fresh}
+        missing = [site for site in SITES if site not in fresh and site not in stale]
+
+        if stale:
+            self.logger.info(f"[CACHE] serving stale {list(stale)} for '{keyword}', refreshing")
+            self.cache.revalidate(keyword, list(stale), self.scraper.submit)
+
+        if not missing:
+            return results, []
+
+        timed_out = []
         try:
-            result = subprocess.run(
-                ["python", "tools/scraper.py", keyword],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-
-            if result.stderr:
-                self.logger.warning(f"[SCRAPER STDERR] {result.stderr.strip()}")
+            scraped, timed_out = self.scraper.scrape_within(keyword, deadline, missing)
+            self.cache.save(keyword, scraped)
+            results.update(scraped)
 
-            raw_output = result.stdout.strip()
-
-            if not raw_output.startswith("{"):
-                self.logger.error("[SCRAPER ERROR] Invalid JSON output")
-                return {"myntra": [], "flipkart": [], "nykaa": [], "amazon": []}
-
-            return json.loads(raw_output)
+            if timed_out:
+                self.logger.warning(f"[DEADLINE] {timed_out} cancelled after {deadline}s for '{keyword}'")
 
         except Exception as e:
             self.logger.error("Scraper error: " + str(e))
-            return {"myntra": [], "flipkart": [], "nykaa": [], "amazon": []}
+
+        return results, timed_out
+
+    async def stream_sites(self, keyword: str, deadline: Optional[float] = None):
+        """
+        Async generator yielding {"site", "products", "cached",
+        "matched_products"} for each site as soon as it is available — cached
+        sites first, then scraped sites in the order they finish.
+        "matched_products" holds the cross-site groups found so far, updated
+        incrementally with each site. Sites still running when `deadline`
+        seconds have passed are cancelled and yielded with "timed_out": True;
+        they are also cancelled if the consumer stops iterating early.
+        """
+        deadline = QUERY_DEADLINE if deadline is None else deadline
+        expires = time.monotonic() + deadline
+        matcher = IncrementalMatcher()
+        fresh, stale = self.cache.lookup(keyword, SITES)
+        if stale:
+            self.cache.revalidate(keyword, list(stale), self.scraper.submit)
+
+        for site, products in {**stale, **fresh}.items():
+            yield {"site": site, "products": products, "cached": True, "matched_products": matcher.add(site, products)}
+
+        missing = [site for site in SITES if site not in fresh and site not in stale]
+        if not missing:
+            return
+
+        cancel = threading.Event()
+        site_futures = self.scraper.submit_sites(keyword, missing, cancel=cancel)
+        futures = {asyncio.wrap_future(future): site for future, site in site_futures.items()}
+        pending = set(futures)
+
+        # Whatever ends the stream — deadline, error or the consumer going away
+        # (client disconnect, generator closed) — stops the site jobs still running
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=max(expires - time.monotonic(), 0), return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    cancel_sites(site_futures, cancel)
+                    for future in pending:
+                        yield {
+                            "site": futures[future],
+                            "products": [],
+                            "cached": False,
+                            "timed_out": True,
+                            "matched_products": matcher.groups(),
+                        }
+                    return
+
+                for future in done:
+                    site = futures[future]
+                    try:
+                        products = future.result()
+                    except Exception as e:
+                        self.logger.error(f"Scraper error ({site}): {e}")
+                        products = []
+
+                    self.cache.save(keyword, {site: products})
+                    yield {"site": site, "products": products, "cached": False, "matched_products": matcher.add(site, products)}
+        finally:
+            cancel_sites(site_futures, cancel)
 
     # ─────────────────────────────────────────────
     # MATCH %
     # ─────────────────────────────────────────────
-    def calculate_match(self, names, keyword):
-        if not names:
-            return 0.0
-
-        keyword = normalize_name(keyword).lower()
-        match_count = 0
-
-        for name in names:
-            name = normalize_name(name).lower()
-
-            if keyword in name:
-                match_count += 1
-            elif SequenceMatcher(None, keyword, name).ratio() > 0.5:
-                match_count += 1
-
-        return round((match_count / len(names)) * 100, 2)
+    def calculate_match(self, products, keyword):
+        """(match %, products ordered most relevant to `keyword` first)."""
+        return rank_by_relevance(products, keyword)
 
     # ─────────────────────────────────────────────
     # MATCH PRODUCTS
     # ─────────────────────────────────────────────
-    def match_products_across_sites(self, myntra, flipkart, nykaa, amazon):
-        matched = []
-        all_products = []
-
-        for site, products in [
+    def match_products_across_sites(self, myntra, flipkart, nykaa, amazon, backend=DEFAULT_BACKEND):
+        sites = [
             ("myntra", myntra),
             ("flipkart", flipkart),
             ("nykaa", nykaa),
             ("amazon", amazon)
-        ]:
-            for p in products:
-                if not p.get("name"):
-                    continue
-                p["source"] = site
-                p["normalized"] = normalize_name(p["name"])
-                all_products.append(p)
-
-        seen = set()
-
-        for i, p1 in enumerate(all_products):
-            if i in seen:
-                continue
+        ]
+        # Known products resolve through the catalog; only new ones are fuzzy-matched
+        if self.catalog is not None and backend == DEFAULT_BACKEND:
+            return match_with_catalog(sites, self.catalog)
+        return match_products(sites, backend=backend)
 
-            group = {"myntra": None, "flipkart": None, "nykaa": None, "amazon": None}
-            group[p1["source"]] = p1
-            seen.add(i)
-
-            for j in range(i + 1, len(all_products)):
-                if j in seen:
-                    continue
+    # ─────────────────────────────────────────────
+    # SUMMARY
+    # ─────────────────────────────────────────────
+    def summary_prompt(self, keyword, myntra, flipkart, nykaa, amazon):
+        sections = site_sections({"myntra": myntra, "flipkart": flipkart, "nykaa": nykaa, "amazon": amazon})
+        return build_prompt("summary", lambda body: f"""
+Compare products for '{keyword}' across Myntra, Flipkart, Nykaa and Amazon.
 
-                p2 = all_products[j]
-                sim = SequenceMatcher(None, p1["normalized"], p2["normalized"]).ratio()
+{body}
 
-                if sim > 0.7:
-                    group[p2["source"]] = p2
-                    seen.add(j)
+Give short 2-3 line summary.
+""", sections)
 
-            if sum(1 for v in group.values() if v) >= 2:
-                matched.append(group)
+    def generate_summary(self, keyword, myntra, flipkart, nykaa, amazon):
+        try:
+            prompt = self.summary_prompt(keyword, myntra, flipkart, nykaa, amazon)
+            return self.llm_cache.cached(
+                self.models.model_for("summary"), "summary", prompt,
+                lambda: self.models.generate("summary", prompt=prompt, priority=BACKGROUND).get("response", "")
+            )
 
-        return matched
+        except:
+            return "Summary unavailable."
 
     # ─────────────────────────────────────────────
-    # SUMMARY
+    # SEARCH INSIGHTS (summary + suggestions, one generation)
     # ─────────────────────────────────────────────
-    def generate_summary(self, keyword, myntra, flipkart, nykaa, amazon):
-        try:
-            prompt = f"""
+    def insights_prompt(self, keyword, myntra, flipkart, nykaa, amazon, count=5):
+        sections = site_sections({"myntra": myntra, "flipkart": flipkart, "nykaa": nykaa, "amazon": amazon})
+        return build_prompt("insights", lambda body: f"""
 Compare products for '{keyword}' across Myntra, Flipkart, Nykaa and Amazon.
 
-Myntra: {[p['name'] for p in myntra]}
-Flipkart: {[p['name'] for p in flipkart]}
-Nykaa: {[p['name'] for p in nykaa]}
-Amazon: {[p['name'] for p in amazon]}
+{body}
 
-Give short 2-3 line summary.
-"""
+Reply with a JSON object only, no other text:
+{{"summary": "<short 2-3 line summary of these results>",
+  "suggestions": [<{count} related beauty product search phrases, each under 6 words>]}}
+""", sections)
 
-            result = self.llm.generate(model=self.model, prompt=prompt)
-            return result.get("response", "")
+    def generate_search_insights(self, keyword, myntra, flipkart, nykaa, amazon):
+        """
+        {"summary", "suggestions"} from a single JSON-mode generation. If the
+        model's reply is malformed, falls back to the separate summary and
+        suggestion calls.
+        """
+        prompt = self.insights_prompt(keyword, myntra, flipkart, nykaa, amazon)
 
-        except:
-            return "Summary unavailable."
+        def ask():
+            response = self.models.generate("insights", prompt=prompt, format="json", priority=BACKGROUND)
+            insights = parse_insights(response.get("response", ""))
+            if insights is None:
+                raise ValueError("malformed insights JSON")
+            return insights
+
+        try:
+            return self.llm_cache.cached(self.models.model_for("insights"), "insights", prompt, ask)
+        except Exception as e:
+            self.logger.warning(f"Fused insights failed for '{keyword}' ({e}), using separate calls")
+
+        return {
+            "summary": self.generate_summary(keyword, myntra, flipkart, nykaa, amazon),
+            "suggestions": generate_suggestions(keyword),
+        }
+
+    def submit_insights(self, keyword, myntra, flipkart, nykaa, amazon):
+        """Start generating the search insights in the background and register them under `keyword`."""
+        future = _summary_executor.submit(self.generate_search_insights, keyword, myntra, flipkart, nykaa, amazon)
+        key = normalize_keyword(keyword)
+        with _insights_lock:
+            _insights[key] = future
+            _insights.move_to_end(key)
+            while len(_insights) > MAX_TRACKED_SUMMARIES:
+                _insights.popitem(last=False)
+        return future
+
+    def get_insights(self, keyword: str, timeout: Optional[float] = None):
+        """
+        {"summary", "suggestions"} for the latest search of `keyword`, waiting
+        up to `timeout` seconds (None waits until done). Returns None if they
+        are not ready yet or no search for `keyword` is known.
+        """
+        with _insights_lock:
+            future = _insights.get(normalize_keyword(keyword))
+        if future is None:
+            return None
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            return None
+
+    def get_summary(self, keyword: str, timeout: Optional[float] = None):
+        insights = self.get_insights(keyword, timeout)
+        return insights["summary"] if insights else None
+
+    def get_suggestions(self, keyword: str, timeout: Optional[float] = None):
+        insights = self.get_insights(keyword, timeout)
+        return insights["suggestions"] if insights else None
 
     # ─────────────────────────────────────────────
     # MAIN FUNCTION
     # ─────────────────────────────────────────────
-    def compare_sites(self, keyword: str):
+    def compare_sites(self, keyword: str, deadline: Optional[float] = None):
+        return _compare_flights.do(normalize_keyword(keyword), self._compare_sites, keyword, deadline)
 
-        raw = self.scrape_combined_subprocess(keyword)
+    async def process_query(self, keyword: str):
+        return await asyncio.to_thread(self.compare_sites, keyword)
 
-        myntra = raw.get("myntra", [])
-        flipkart = raw.get("flipkart", [])
-        nykaa = raw.get("nykaa", [])
-        amazon = raw.get("amazon", [])
+    def metrics(self):
+        return {
+            "compare": _compare_flights.stats(),
+            "scrape_cache": self.cache.stats(),
+            "scraper": self.scraper.stats(),
+            "catalog": self.catalog.stats() if self.catalog is not None else None,
+            "llm_cache": self.llm_cache.stats(),
+            "llm": self.llm.stats(),
+            "models": self.models.stats(),
+            "prompts": prompt_stats(),
+        }
+
+    def _compare_sites(self, keyword: str, deadline: Optional[float] = None):
+
+        raw, timed_out = self.scrape_combined(keyword, deadline)
+
+        myntra_match, myntra = self.calculate_match(raw.get("myntra", []), keyword)
+        flipkart_match, flipkart = self.calculate_match(raw.get("flipkart", []), keyword)
+        nykaa_match, nykaa = self.calculate_match(raw.get("nykaa", []), keyword)
+        amazon_match, amazon = self.calculate_match(raw.get("amazon", []), keyword)
 
         self.logger.info(
             f"Counts → Myntra:{len(myntra)}, Flipkart:{len(flipkart)}, Nykaa:{len(nykaa)}, Amazon:{len(amazon)}"
         )
 
-        myntra_names = [p["name"] for p in myntra if p.get("name")]
-        flipkart_names = [p["name"] for p in flipkart if p.get("name")]
-        nykaa_names = [p["name"] for p in nykaa if p.get("name")]
-        amazon_names = [p["name"] for p in amazon if p.get("name")]
+        self.submit_insights(keyword, myntra[:3], flipkart[:3], nykaa[:3], amazon[:3])
 
         return {
-            "myntra_match": self.calculate_match(myntra_names, keyword),
-            "flipkart_match": self.calculate_match(flipkart_names, keyword),
-            "nykaa_match": self.calculate_match(nykaa_names, keyword),
-            "amazon_match": self.calculate_match(amazon_names, keyword),
+            "myntra_match": myntra_match,
+            "flipkart_match": flipkart_match,
+            "nykaa_match": nykaa_match,
+            "amazon_match": amazon_match,
 
             "myntra_total": len(myntra),
             "flipkart_total": len(flipkart),
             "nykaa_total": len(nykaa),
             "amazon_total": len(amazon),
 
-            "summary": self.generate_summary(keyword, myntra[:3], flipkart[:3], nykaa[:3], amazon[:3]),
+            # Filled in later — collect with get_summary / get_suggestions(keyword)
+            "summary": None,
+            "suggestions": None,
 
             "matched_products": self.match_products_across_sites(
                 myntra, flipkart, nykaa, amazon
@@ -188,5 +328,7 @@ Give short 2-3 line summary.
             "top_myntra": myntra,
             "top_flipkart": flipkart,
             "top_nykaa": nykaa,
-            "top_amazon": amazon
+            "top_amazon": amazon,
+
+            "timed_out": timed_out
         }
\ No newline at end of file
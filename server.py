@@ -1,13 +1,17 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 from mcp_client import MCPClient
+from utils.product import Product
+from utils.ai_suggestor import compare_products_stream
 from auth.routes import router as auth_router  
 import logging
 import asyncio
+import json
 
 load_dotenv()
 
@@ -30,16 +34,6 @@ async def lifespan(app: FastAPI):
         logger.error("Failed to connect to MCP server.")
         raise RuntimeError("Could not connect to MCP server during startup.")
 
-    async def warmup_model():
-        try:
-            logger.info("Warming up Mistral model...")
-            result = client.llm.generate(model="tinyllama", prompt="hello", stream=False)
-            logger.info("tinyllama warm-up completed.")
-        except Exception as e:
-            logger.warning(f"tinyllama warm-up skipped or failed: {e}")
-
-    await warmup_model()
-
     app.state.client = client
     yield
 
@@ -69,6 +63,38 @@ async def compare(req: CompareRequest):
         logger.exception("Error during comparison:")
         raise HTTPException(status_code=500, detail=str(e))
 
+class CompareProductsRequest(BaseModel):
+    product1: str
+    product2: str
+
+@app.post("/compare-products/stream")
+def compare_products_stream_endpoint(req: CompareProductsRequest):
+    """Plain-text AI comparison of two products, sent token by token as it is generated."""
+    return StreamingResponse(compare_products_stream(req.product1, req.product2), media_type="text/plain; charset=utf-8")
+
+@app.post("/compare/stream")
+async def compare_stream(req: CompareRequest):
+    async def records():
+        async for record in app.state.client.stream_sites(req.keyword):
+            yield json.dumps(record, default=Product.to_dict) + "\n"
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+@app.get("/summary")
+async def summary(keyword: str, wait: float = 0):
+    """Poll for the LLM summary and suggestions of a /compare search, optionally waiting up to `wait` seconds."""
+    insights = await asyncio.to_thread(app.state.client.get_insights, keyword, wait)
+    return {
+        "keyword": keyword,
+        "ready": insights is not None,
+        "summary": insights["summary"] if insights else None,
+        "suggestions": insights["suggestions"] if insights else None,
+    }
+
+@app.get("/metrics")
+def metrics():
+    return app.state.client.metrics()
+
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
@@ -3,12 +3,13 @@ import random
 import hashlib
 import re
 import os
+import time
 import requests
 from dotenv import load_dotenv
 from utils.logger import logger
 from mcp_client import MCPClient
 from utils.wishlist_manager import load_wishlist, add_to_wishlist, remove_from_wishlist
-from utils.ai_suggestor import generate_suggestions, compare_products
+from utils.ai_suggestor import generate_suggestions, compare_products_stream
 from requests.exceptions import RequestException
 
 st.set_page_config(page_title="GLAM — Beauty Price Comparator", layout="wide", page_icon="🌸")
@@ -490,6 +491,10 @@ section[data-testid="stSidebar"] > div {
 
 # 🌐 ENV + Auth State
 FLASK_API_URL = os.getenv("FLASK_API_URL")
+# Seconds the results page waits for the background LLM summary after rendering
+SUMMARY_WAIT = float(os.getenv("SUMMARY_WAIT", "60"))
+# How often the results page checks whether the summary is ready
+SUMMARY_POLL = float(os.getenv("SUMMARY_POLL", "2"))
 auth = {"logged_in": False, "username": None, "role": None}
 
 try:
@@ -611,13 +616,17 @@ if auth["logged_in"]:
 
                 if st.button("Compare", key="trigger_compare", use_container_width=True):
                     if selected_1 != selected_2:
-                        with st.spinner("Analysing…"):
-                            try:
-                                response = compare_products(selected_1, selected_2)
-                                st.markdown(f'<div class="compare-result">{response}</div>', unsafe_allow_html=True)
-                            except Exception as e:
-                                logger.error("Compare error: " + str(e))
-                                st.warning("Comparison failed.")
+                        # Show the comparison as it is written instead of behind a spinner
+                        slot = st.empty()
+                        slot.markdown('<div class="compare-result">Analysing…</div>', unsafe_allow_html=True)
+                        try:
+                            response = ""
+                            for piece in compare_products_stream(selected_1, selected_2):
+                                response += piece
+                                slot.markdown(f'<div class="compare-result">{response}</div>', unsafe_allow_html=True)
+                        except Exception as e:
+                            logger.error("Compare error: " + str(e))
+                            st.warning("Comparison failed.")
                     else:
                         st.warning("Choose two different products.")
             else:
@@ -746,6 +755,11 @@ def clean_price(p):
     return str(p).replace("Rs.", "₹").replace("INR", "₹") if p else "—"
 
 def extract_numeric_price(p):
+    # Products carry their price pre-parsed; plain dicts and raw strings go through the regex
+    if hasattr(p, "price_paise"):
+        return p.price_paise // 100
+    if isinstance(p, dict):
+        p = p.get("price")
     if not p:
         return 0
     match = re.search(r"[\d,]+", str(p))
@@ -765,7 +779,7 @@ def show_product_grid(products, title, price_range):
 
     filtered_products = [
         p for p in products
-        if price_range[0] <= extract_numeric_price(p.get("price")) <= price_range[1]
+        if price_range[0] <= extract_numeric_price(p) <= price_range[1]
     ]
 
     if not filtered_products:
@@ -818,6 +832,7 @@ if search and cleaned_query:
         try:
             res = st.session_state.client.compare_sites(cleaned_query)
             st.session_state.stored_result = res
+            st.session_state.insights_deadline = time.time() + SUMMARY_WAIT
         except Exception as e:
             logger.error("Error calling compare_sites(): " + str(e))
             st.error("Something went wrong while fetching results.")
@@ -836,11 +851,16 @@ if st.session_state.stored_result:
 
     col1, col2, col3, col4 = st.columns(4)
 
+    timed_out = res.get("timed_out", [])
+
+    def site_total(site):
+        return "timed out" if site in timed_out else f"{res[f'{site}_total']} products"
+
     metrics_data = [
-        (col1, "Myntra",   f"{res['myntra_match']}%",   f"{res['myntra_total']} products"),
-        (col2, "Flipkart", f"{res['flipkart_match']}%", f"{res['flipkart_total']} products"),
-        (col3, "Nykaa",    f"{res['nykaa_match']}%",    f"{res['nykaa_total']} products"),
-        (col4, "Amazon",   f"{res['amazon_match']}%",   f"{res['amazon_total']} products"),
+        (col1, "Myntra",   f"{res['myntra_match']}%",   site_total("myntra")),
+        (col2, "Flipkart", f"{res['flipkart_match']}%", site_total("flipkart")),
+        (col3, "Nykaa",    f"{res['nykaa_match']}%",    site_total("nykaa")),
+        (col4, "Amazon",   f"{res['amazon_match']}%",   site_total("amazon")),
     ]
 
     for col, label, match, total in metrics_data:
@@ -853,10 +873,24 @@ if st.session_state.stored_result:
                 </div>
             """, unsafe_allow_html=True)
 
-    summary = res.get("summary", "—")
-    sentences = re.split(r'(?<=[.!?])\s+', summary)
-    short_summary = " ".join(sentences[:2]) if len(sentences) >= 2 else summary
-    st.markdown(f'<div class="summary-strip">{short_summary}</div>', unsafe_allow_html=True)
+    @st.fragment(run_every=SUMMARY_POLL)
+    def await_insights(query, res):
+        # Only this fragment reruns while the summary is generated; the page rerenders once it is in
+        insights = st.session_state.client.get_insights(query, timeout=0)
+        if insights is None and time.time() < st.session_state.get("insights_deadline", 0):
+            st.markdown('<div class="summary-strip">Writing a summary…</div>', unsafe_allow_html=True)
+            return
+        insights = insights or {}
+        res["summary"] = insights.get("summary") or "Summary unavailable."
+        res["suggestions"] = insights.get("suggestions")
+        st.rerun()
+
+    if res.get("summary") is None:
+        await_insights(cleaned_query, res)
+    else:
+        sentences = re.split(r'(?<=[.!?])\s+', res["summary"])
+        short_summary = " ".join(sentences[:2]) if len(sentences) >= 2 else res["summary"]
+        st.markdown(f'<div class="summary-strip">{short_summary}</div>', unsafe_allow_html=True)
 
     with st.expander("Filter by Price Range", expanded=False):
         price_range = st.slider("Price (₹)", 0, 10000, (0, 10000), step=100)
@@ -950,8 +984,13 @@ if st.session_state.stored_result:
                         color:var(--rose);margin-bottom:14px;">AI Suggestions</div>
         """, unsafe_allow_html=True)
         try:
-            suggestions = generate_suggestions(cleaned_query)
-            if suggestions:
+            # Produced with the summary in one generation; ask directly only if that came back without them
+            if res.get("summary") is not None and res.get("suggestions") is None:
+                res["suggestions"] = generate_suggestions(cleaned_query)
+            suggestions = res.get("suggestions")
+            if res.get("summary") is None:
+                st.markdown('<div class="suggestion-row">Finding suggestions…</div>', unsafe_allow_html=True)
+            elif suggestions:
                 for s in suggestions:
                     suggestion_query = s.replace(" ", "+")
                     st.markdown(f"""
@@ -0,0 +1,327 @@
+"""
+Offline accuracy / latency benchmark for product matching.
+
+    python tools/bench_matching.py
+    python tools/bench_matching.py --sizes 100 1000 --backends blocked tfidf --json
+
+Uses the labelled corpus in tools/bench_corpus.json (products sharing a
+"label" are the same item) plus synthetic expansions of it to each size.
+Nothing is scraped and, unless the embedding backend is selected, no model
+is called.
+"""
+import os
+import sys
+import json
+import math
+import random
+import argparse
+import tracemalloc
+from itertools import combinations
+from time import perf_counter
+
+if __package__ in (None, ""):
+    # Running as `python tools/bench_matching.py` — make the project root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.matcher import MATCH_BACKENDS, SITE_ORDER, match_products, normalize_name
+from utils.product import Product
+from utils.relevance import rank_by_relevance
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus.json")
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+# All-pairs backends stop being useful long before 100k
+BACKEND_MAX_SIZE = {"exhaustive": 2000, "embedding": 10000}
+
+SHADES = ["101 Ivory", "112 Natural Ivory", "120 Classic Ivory", "128 Warm Nude", "220 Natural Beige",
+          "230 Natural Buff", "310 Sun Beige", "Ruby Woo", "Maroon Stroke", "Deep Black", "Pink Rose",
+          "Peach", "Coral Crush", "Nude Pink", "Berry Bliss", "Mocha", "Brick Red", "Rose Gold"]
+SIZES = ["3.6 g", "4.5ml", "6 ml", "9 g", "12g", "30ml", "50 ml", "0.35 g", "2.8 g", "100ml"]
+LINES = ["Matte", "Velvet", "Creme", "Liquid", "Long Stay", "Transfer Proof", "Ultra", "Hydra", "Glow",
+         "Soft", "Intense", "Perfect Cover", "Absolute", "Sensational", "Colossal", "Professional"]
+SYLLABLES = ["la", "ka", "mi", "ro", "ve", "lu", "na", "si", "ta", "zo", "be", "qu", "fi", "do", "ra", "mo"]
+NOISE = ["combo", "pack", "for women", "with spf", "new", "-", "|", "(Black)", "Pack of 1"]
+
+
+# ─────────────────────────────────────────────
+# CORPUS
+# ─────────────────────────────────────────────
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["products"]
+
+
+def perturb(name, rng):
+    """One site's rendering of a product name: noise words, sizes, casing, a typo."""
+    words = name.split()
+    if rng.random() < 0.3:
+        words.append(rng.choice(NOISE))
+    if rng.random() < 0.3:
+        words.append(rng.choice(SIZES))
+    if rng.random() < 0.15 and len(words) > 3:
+        i = rng.randrange(1, len(words))
+        words[i - 1], words[i] = words[i], words[i - 1]
+    if rng.random() < 0.1:
+        i = rng.randrange(len(words))
+        if len(words[i]) > 4:
+            j = rng.randrange(1, len(words[i]) - 1)
+            words[i] = words[i][:j] + words[i][j + 1:]
+    name = " ".join(words)
+    return name.upper() if rng.random() < 0.05 else name
+
+
+def coined_word(rng):
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+
+
+def expand(corpus, size, seed=7):
+    """
+    `size` labelled products: the corpus itself, then synthetic families built
+    from a corpus family with a new product line, shade and brand, rendered
+    on 1–4 sites with per-site perturbations. Coined line and brand words
+    make the vocabulary grow with the catalog, as it does in real listings.
+    """
+    rng = random.Random(seed)
+    products = [dict(p) for p in corpus[:size]]
+    families = {}
+    for p in corpus:
+        families.setdefault(p["label"], p)
+    templates = list(families.values())
+    brands = sorted({p["brand"] for p in corpus}) + [coined_word(rng) for _ in range(max(size // 200, 1))]
+
+    n = 0
+    while len(products) < size:
+        base = rng.choice(templates)
+        brand = rng.choice(brands)
+        line = f"{coined_word(rng)} {rng.choice(LINES)}"
+        shade = rng.choice(SHADES)
+        stem = " ".join(w for w in normalize_name(base["name"]).split()[:2] if not w[0].isdigit())
+        name = f"{brand} {line} {stem.title()} {base['keyword'].title()} - {shade}"
+        label = f"synthetic-{n}"
+        n += 1
+
+        for site in rng.sample(SITE_ORDER, rng.randint(1, 4)):
+            if len(products) >= size:
+                break
+            products.append({
+                "site": site,
+                "label": label,
+                "keyword": base["keyword"],
+                "brand": brand,
+                "name": perturb(name, rng),
+                "price": f"₹{rng.randint(99, 2999)}",
+            })
+    return products
+
+
+# Listing URLs in each site's real shape, so every product gets its own site id
+LISTING_URLS = {
+    "myntra": "https://www.myntra.com/makeup/bench/item/{i}/buy",
+    "flipkart": "https://www.flipkart.com/item/p/itmbench?pid=BENCH{i}",
+    "nykaa": "https://www.nykaa.com/item/p/{i}",
+    "amazon": "https://www.amazon.in/item/dp/B{i:09d}",
+}
+
+
+def to_sites(products):
+    """[(site, [Product])] plus {product id: label}."""
+    by_site = {site: [] for site in SITE_ORDER}
+    labels = {}
+    for i, p in enumerate(products):
+        link = LISTING_URLS[p["site"]].format(i=i)
+        product = Product.create(p["site"], p["name"], p["price"], link=link, brand=p["brand"])
+        by_site[p["site"]].append(product)
+        labels[product.id] = p["label"]
+    return [(site, by_site[site]) for site in SITE_ORDER], labels
+
+
+# ─────────────────────────────────────────────
+# METRICS
+# ─────────────────────────────────────────────
+def true_pairs(sites, labels):
+    """Cross-site pairs of products that share a label."""
+    by_label = {}
+    for site, products in sites:
+        for p in products:
+            by_label.setdefault(labels[p.id], []).append(p)
+    return {
+        frozenset((a.id, b.id))
+        for members in by_label.values()
+        for a, b in combinations(members, 2)
+        if a.source != b.source
+    }
+
+
+def predicted_pairs(groups):
+    return {
+        frozenset((a.id, b.id))
+        for group in groups
+        for a, b in combinations([p for p in group.values() if p], 2)
+    }
+
+
+def precision_recall(groups, truth):
+    predicted = predicted_pairs(groups)
+    hits = len(predicted & truth)
+    precision = hits / len(predicted) if predicted else 1.0
+    recall = hits / len(truth) if truth else 1.0
+    return precision, recall
+
+
+def measure(fn, *args, **kwargs):
+    """(result, wall seconds, peak traced MiB). Timing and memory are separate runs."""
+    start = perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        fn(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, elapsed, peak / (1024 * 1024)
+
+
+def scaling_exponent(points):
+    """Least-squares slope of log(time) against log(n) — k in time ∝ n^k."""
+    points = [(math.log(n), math.log(t)) for n, t in points if n > 0 and t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var
+
+
+# ─────────────────────────────────────────────
+# BENCHMARKS
+# ─────────────────────────────────────────────
+def bench_normalize(products):
+    names = [p["name"] for p in products]
+    _, elapsed, peak = measure(lambda: [normalize_name(n) for n in names])
+    return {"seconds": elapsed, "peak_mib": peak}
+
+
+def bench_relevance(sites, products):
+    keywords = sorted({p["keyword"] for p in products})
+
+    def run():
+        for keyword in keywords:
+            for _, site_products in sites:
+                rank_by_relevance(site_products, keyword)
+
+    _, elapsed, peak = measure(run)
+    return {"seconds": elapsed, "peak_mib": peak, "keywords": len(keywords)}
+
+
+def bench_backend(backend, sites, truth):
+    try:
+        groups, elapsed, peak = measure(match_products, sites, backend=backend)
+    except ImportError as e:
+        return {"skipped": str(e)}
+    precision, recall = precision_recall(groups, truth)
+    return {
+        "seconds": elapsed,
+        "peak_mib": peak,
+        "groups": len(groups),
+        "precision": precision,
+        "recall": recall,
+    }
+
+
+def warm_up(backends, corpus):
+    """Run each backend once on the corpus so imports and first-call costs stay out of the timings."""
+    sites, _ = to_sites(corpus)
+    for backend in backends:
+        try:
+            match_products(sites, backend=backend)
+        except ImportError:
+            pass
+
+
+def run(sizes, backends, seed, budget):
+    corpus = load_corpus()
+    report = {"sizes": {}, "scaling": {}}
+    over_budget = {}
+    warm_up(backends, corpus)
+
+    for size in sizes:
+        products = expand(corpus, size, seed)
+        sites, labels = to_sites(products)
+        truth = true_pairs(sites, labels)
+
+        row = {
+            "products": len(products),
+            "true_pairs": len(truth),
+            "normalize_name": bench_normalize(products),
+            "calculate_match": bench_relevance(sites, products),
+            "match": {},
+        }
+        for backend in backends:
+            if size > BACKEND_MAX_SIZE.get(backend, size):
+                row["match"][backend] = {"skipped": f"above {BACKEND_MAX_SIZE[backend]} products"}
+                continue
+            if backend in over_budget:
+                row["match"][backend] = {"skipped": f"{over_budget[backend]:.0f}s at a smaller size, over budget"}
+                continue
+
+            result = row["match"][backend] = bench_backend(backend, sites, truth)
+            if result.get("seconds", 0) > budget:
+                over_budget[backend] = result["seconds"]
+
+        report["sizes"][size] = row
+        print_row(size, row)
+
+    for backend in backends:
+        points = [
+            (size, row["match"][backend]["seconds"])
+            for size, row in report["sizes"].items()
+            if "seconds" in row["match"][backend]
+        ]
+        report["scaling"][backend] = {"points": points, "exponent": scaling_exponent(points)}
+
+    print_scaling(report["scaling"])
+    return report
+
+
+# ─────────────────────────────────────────────
+# OUTPUT
+# ─────────────────────────────────────────────
+def print_row(size, row, out=sys.stderr):
+    print(f"\n── {size} products ({row['true_pairs']} true cross-site pairs) ──", file=out)
+    print(f"  normalize_name   {row['normalize_name']['seconds'] * 1000:10.1f} ms"
+          f"  {row['normalize_name']['peak_mib']:8.1f} MiB", file=out)
+    print(f"  calculate_match  {row['calculate_match']['seconds'] * 1000:10.1f} ms"
+          f"  {row['calculate_match']['peak_mib']:8.1f} MiB", file=out)
+    for backend, result in row["match"].items():
+        if "skipped" in result:
+            print(f"  {backend:<16} skipped ({result['skipped']})", file=out)
+            continue
+        print(f"  {backend:<16} {result['seconds'] * 1000:10.1f} ms  {result['peak_mib']:8.1f} MiB"
+              f"  P={result['precision']:.3f} R={result['recall']:.3f}  groups={result['groups']}", file=out)
+
+
+def print_scaling(scaling, out=sys.stderr):
+    print("\n── scaling (time ∝ n^k) ──", file=out)
+    for backend, curve in scaling.items():
+        k = curve["exponent"]
+        print(f"  {backend:<16} k={k:.2f}" if k is not None else f"  {backend:<16} k=n/a", file=out)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--backends", nargs="+", default=["blocked", "exhaustive", "tfidf"],
+                        choices=sorted(MATCH_BACKENDS))
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--budget", type=float, default=120,
+                        help="skip larger sizes for a backend once one run takes longer than this (seconds)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON on stdout")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.backends, args.seed, args.budget)
+    if args.json:
+        print(json.dumps(report, indent=2))
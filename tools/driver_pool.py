@@ -0,0 +1,180 @@
+import logging
+import threading
+import time
+import concurrent.futures
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """
+    Pool of pre-launched Chrome drivers shared by the site scrapers.
+
+    Drivers are checked out per site, reset (cookies, storage, extra windows)
+    when they come back, health-checked before reuse and recycled after
+    `max_uses` checkouts so a long-lived Chrome never accumulates state.
+    """
+
+    def __init__(self, factory, size=4, max_uses=25, acquire_timeout=60):
+        self._factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = []
+        self._uses = {}
+        self._created = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    # ─────────────────────────────────────────────
+    # LIFECYCLE
+    # ─────────────────────────────────────────────
+    def warm(self, count=None):
+        """Launch drivers up front so the first searches skip the cold start."""
+        with self._cond:
+            count = min(count or self.size, self.size - self._created)
+            if count <= 0:
+                return 0
+            self._created += count
+
+        launched = []
+        with concurrent.futures.ThreadPoolExecutor(max_workers=count) as executor:
+            for future in [executor.submit(self._factory) for _ in range(count)]:
+                try:
+                    launched.append(future.result())
+                except Exception as e:
+                    logger.warning(f"Driver warm-up failed: {e}")
+
+        with self._cond:
+            self._created -= count - len(launched)
+            for driver in launched:
+                self._uses[driver] = 0
+                self._idle.append(driver)
+            self._cond.notify_all()
+
+        logger.info(f"Driver pool warmed with {len(launched)} driver(s).")
+        return len(launched)
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+
+        for driver in idle:
+            self._quit(driver)
+
+    # ─────────────────────────────────────────────
+    # CHECKOUT / CHECKIN
+    # ─────────────────────────────────────────────
+    def acquire(self):
+        deadline = time.monotonic() + self.acquire_timeout
+        driver = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is shut down.")
+                if self._idle:
+                    driver = self._idle.pop()
+                    break
+                if self._created < self.size:
+                    self._created += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a free Chrome driver.")
+                self._cond.wait(remaining)
+
+        if driver is not None and not self._is_healthy(driver):
+            logger.info("Replacing unhealthy driver in pool.")
+            with self._cond:
+                self._uses.pop(driver, None)
+            self._quit(driver)
+            driver = None
+
+        if driver is None:
+            try:
+                driver = self._factory()
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify()
+                raise
+
+        with self._cond:
+            self._uses[driver] = self._uses.get(driver, 0) + 1
+        return driver
+
+    def release(self, driver):
+        with self._cond:
+            worn_out = self._uses.get(driver, 0) >= self.max_uses
+            closed = self._closed
+
+        if worn_out or closed or not self._reset(driver):
+            with self._cond:
+                self._created -= 1
+                self._uses.pop(driver, None)
+                self._cond.notify()
+            self._quit(driver)
+            return
+
+        with self._cond:
+            self._idle.append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self):
+        driver = self.acquire()
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def stats(self):
+        with self._cond:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": self._created - len(self._idle),
+                "max_uses": self.max_uses,
+            }
+
+    # ─────────────────────────────────────────────
+    # HELPERS
+    # ─────────────────────────────────────────────
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _reset(self, driver):
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except Exception:
+                pass
+
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.info(f"Driver reset failed, recycling: {e}")
+            return False
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import logging
+import requests
+from urllib.parse import quote, quote_plus
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIER_TIMEOUT", "6"))
+
+# Sites whose search pages carry the product list in server-rendered HTML or
+# inline JSON. Nykaa renders its grid client-side, so it goes straight to Chrome.
+HTTP_TIER_SITES = set(filter(None, os.getenv("HTTP_TIER_SITES", "myntra,amazon,flipkart").split(",")))
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+_session = None
+
+
+def get_session():
+    """Shared keep-alive session so repeat searches reuse TCP/TLS connections."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.headers.update(HEADERS)
+        _session = session
+    return _session
+
+
+# ─────────────────────────────────────────────
+# PARSERS — each returns raw card dicts in the same shape the
+# browser extraction produces, so the scraper's builders apply
+# ─────────────────────────────────────────────
+MYX_RE = re.compile(r"window\.__myx\s*=\s*(\{.*?\})\s*;?\s*</script>", re.S)
+
+
+def parse_myntra(html):
+    match = MYX_RE.search(html)
+    if not match:
+        return []
+
+    data = json.loads(match.group(1))
+    products = data.get("searchData", {}).get("results", {}).get("products", [])
+
+    cards = []
+    for p in products:
+        landing = p.get("landingPageUrl") or ""
+        cards.append({
+            "brand": p.get("brand") or "-",
+            "name": p.get("additionalInfo") or p.get("productName") or "-",
+            "price": f"Rs. {p['price']}" if p.get("price") else "-",
+            "image": p.get("searchImage") or "",
+            "link": f"https://www.myntra.com/{landing.lstrip('/')}" if landing else "",
+        })
+    return cards
+
+
+def _text(root, css):
+    el = root.select_one(css)
+    return el.get_text(strip=True) if el else "-"
+
+
+def _image(root):
+    img = root.select_one("img")
+    if not img:
+        return ""
+    src = img.get("src") or img.get("data-src") or img.get("srcset") or img.get("data-srcset") or ""
+    return src.split(" ")[0] if " " in src else src
+
+
+def parse_amazon(html):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.select("div[data-component-type='s-search-result']"):
+        link = card.select_one("h2 a") or card.select_one("a.a-link-normal[href*='/dp/']")
+        cards.append({
+            "name": _text(card, "h2 span"),
+            "price": _text(card, "span.a-price-whole").rstrip("."),
+            "image": _image(card),
+            "link": link.get("href", "") if link else "",
+        })
+    return cards
+
+
+def parse_flipkart(html):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.select("div[data-id]"):
+        link = card.select_one("a.GnxRXv")
+        img = card.select_one("img.UCc1lI")
+        if not link or not img:
+            continue
+
+        price = "-"
+        for line in card.get_text("\n").split("\n"):
+            matches = re.findall(r"₹(\d+)", line) if "₹" in line else []
+            if matches:
+                price = f"₹{matches[0]}"
+                break
+
+        cards.append({"name": img.get("alt") or "-", "price": price, "image": _image(card), "link": link.get("href", "")})
+    return cards
+
+
+def parse_nykaa(html):
+    soup = BeautifulSoup(html, "html.parser")
+    cards = []
+    for card in soup.select("div.productWrapper"):
+        link = card.select_one("a.css-qlopj4")
+        if not link:
+            continue
+        price = _text(card, "span.css-111z9ua")
+        if price == "-":
+            price = _text(card, "span.css-17x46n5 span")
+        cards.append({"name": _text(card, "div.css-xrzmfa"), "price": price, "image": _image(card), "link": link.get("href", "")})
+    return cards
+
+
+SEARCH_URLS = {
+    "myntra": lambda kw: f"https://www.myntra.com/{quote(kw.replace(' ', '-'))}",
+    "amazon": lambda kw: f"https://www.amazon.in/s?k={quote_plus(kw)}",
+    "flipkart": lambda kw: f"https://www.flipkart.com/search?q={quote_plus(kw)}",
+    "nykaa": lambda kw: f"https://www.nykaa.com/search/result/?q={quote_plus(kw)}",
+}
+
+PARSERS = {
+    "myntra": parse_myntra,
+    "amazon": parse_amazon,
+    "flipkart": parse_flipkart,
+    "nykaa": parse_nykaa,
+}
+
+
+def fetch_cards(site, keyword):
+    """
+    Fetch a site's search page over plain HTTP and parse its cards.
+    Returns [] whenever the page is blocked, empty or unparseable.
+    """
+    if site not in HTTP_TIER_SITES:
+        return []
+
+    try:
+        response = get_session().get(SEARCH_URLS[site](keyword), timeout=HTTP_TIMEOUT)
+        if response.status_code != 200:
+            logger.info(f"[HTTP TIER] {site} returned {response.status_code}")
+            return []
+        return PARSERS[site](response.text)
+    except Exception as e:
+        logger.info(f"[HTTP TIER] {site} fetch/parse failed: {e}")
+        return []
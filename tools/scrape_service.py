@@ -0,0 +1,90 @@
+import os
+import atexit
+import logging
+import threading
+import concurrent.futures
+
+from tools import scraper
+
+logger = logging.getLogger(__name__)
+
+PREWARM_DRIVERS = os.getenv("SCRAPER_PREWARM", "1") == "1"
+
+_service = None
+_service_lock = threading.Lock()
+
+
+class ScrapeService:
+    """
+    Long-lived, in-process scraping service.
+
+    Keeps one site-worker executor and the warm driver pool alive for the whole
+    process, so each keyword job only pays for page loads — no interpreter
+    start-up, Selenium import or JSON round trip through stdout.
+    """
+
+    def __init__(self, max_workers=None, prewarm=PREWARM_DRIVERS):
+        self.pool = scraper.get_driver_pool()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers or max(len(scraper.SITES), self.pool.size),
+            thread_name_prefix="scrape",
+        )
+        self._jobs = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="scrape-job")
+
+        if prewarm:
+            threading.Thread(target=self.pool.warm, name="driver-warmup", daemon=True).start()
+
+    def scrape(self, keyword, sites=None, max_products=10):
+        """Scrape `sites` (default: all) for `keyword` and return {site: [products]}."""
+        return scraper.scrape_all(keyword, self._executor, max_products, sites)
+
+    def scrape_within(self, keyword, timeout, sites=None, max_products=10):
+        """
+        Scrape with an overall `timeout` in seconds. Returns ({site: products}
+        for the sites that finished, [sites that timed out]); browser work for
+        the timed-out sites is cancelled rather than left running.
+        """
+        cancel = threading.Event()
+        futures = scraper.submit_sites(keyword, self._executor, max_products, sites, cancel)
+        done, not_done = concurrent.futures.wait(futures, timeout=max(timeout, 0))
+
+        results = {}
+        for future in done:
+            try:
+                results[futures[future]] = future.result()
+            except Exception:
+                results[futures[future]] = []
+
+        if not_done:
+            scraper.cancel_sites(not_done, cancel)
+        return results, sorted(futures[future] for future in not_done)
+
+    def submit_sites(self, keyword, sites=None, max_products=10, cancel=None):
+        """Start each site separately and return {future: site} for streaming callers."""
+        return scraper.submit_sites(keyword, self._executor, max_products, sites, cancel)
+
+    def stream(self, keyword, sites=None, max_products=10):
+        """Yield (site, products) as each site finishes."""
+        return scraper.iter_scrape(keyword, self._executor, max_products, sites)
+
+    def submit(self, keyword, sites=None, max_products=10):
+        """Queue a keyword job and return a Future for its results."""
+        return self._jobs.submit(self.scrape, keyword, sites, max_products)
+
+    def stats(self):
+        return {"pool": self.pool.stats(), "tiers": scraper.tier_stats.snapshot()}
+
+    def shutdown(self):
+        self._jobs.shutdown(wait=False, cancel_futures=True)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.pool.shutdown()
+
+
+def get_scrape_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            logger.info("Starting in-process scraping service...")
+            _service = ScrapeService()
+            atexit.register(_service.shutdown)
+    return _service
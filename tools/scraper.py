@@ -1,21 +1,111 @@
 import os
+import re
 import sys
 import json
 import time
+import logging
+import argparse
+import atexit
+import threading
 import concurrent.futures
+
+if __package__ in (None, ""):
+    # Running as `python tools/scraper.py` — make the project root importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from dotenv import load_dotenv
+from tools.driver_pool import DriverPool
+from tools import http_fetcher
+from utils.product import Product, to_dicts
 
 load_dotenv()
+logger = logging.getLogger(__name__)
 CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH")
-
-
-def init_driver():
+DRIVER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "4"))
+DRIVER_MAX_USES = int(os.getenv("SCRAPER_DRIVER_MAX_USES", "25"))
+PAGE_LOAD_TIMEOUT = float(os.getenv("SCRAPER_PAGE_LOAD_TIMEOUT", "20"))
+HTTP_TIER_ENABLED = os.getenv("HTTP_TIER", "1") == "1"
+
+# Lean page loads: eager load strategy, no image decoding, heavy assets blocked.
+# We only read DOM attributes, so images keep their src without being fetched.
+LEAN_MODE = os.getenv("SCRAPER_LEAN", "0") == "1"
+BLOCKED_RESOURCE_PATTERNS = {
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3"],
+    "image": ["*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg"],
+    "tracking": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*hotjar.com*", "*clarity.ms*", "*criteo.*",
+    ],
+}
+LEAN_BLOCK_TYPES = os.getenv("SCRAPER_BLOCK_TYPES", "font,media,image,tracking").split(",")
+LEAN_BLOCK_URLS = list(filter(None, os.getenv("SCRAPER_BLOCK_URLS", "").split(",")))
+
+# Longest each site may spend waiting for its product grid to become ready
+SITE_WAIT_DEADLINES = {
+    "myntra": float(os.getenv("SCRAPER_DEADLINE_MYNTRA", "8")),
+    "amazon": float(os.getenv("SCRAPER_DEADLINE_AMAZON", "8")),
+    "flipkart": float(os.getenv("SCRAPER_DEADLINE_FLIPKART", "10")),
+    "nykaa": float(os.getenv("SCRAPER_DEADLINE_NYKAA", "12")),
+}
+NETWORK_IDLE_SECONDS = 0.5
+WAIT_POLL_SECONDS = 0.25
+
+# Shared helpers prepended to every per-site extraction script. They mirror
+# safe_text / get_image / safe_link so both extraction paths agree.
+CARD_HELPERS_JS = """
+const text = (root, css) => {
+    const el = root.querySelector(css);
+    return el ? el.innerText.trim() : "-";
+};
+const image = (root) => {
+    const img = root.querySelector("img");
+    if (!img) return "";
+    const src = img.src || img.getAttribute("data-src") || img.getAttribute("srcset")
+        || img.getAttribute("data-srcset") || "";
+    return src.includes(" ") ? src.split(" ")[0] : src;
+};
+const link = (root, css) => {
+    const a = root.querySelector(css);
+    return a ? a.href || "" : "";
+};
+const cards = Array.from(document.querySelectorAll(arguments[0]));
+"""
+
+# The resource timing buffer stops at 250 entries, so on heavy pages its length
+# stops changing; count finished requests with an observer installed once per page
+READINESS_JS = """
+if (window.__glamResources === undefined) {
+    window.__glamResources = performance.getEntriesByType('resource').length;
+    new PerformanceObserver((list) => {
+        window.__glamResources += list.getEntries().length;
+    }).observe({type: 'resource'});
+}
+return [
+    document.querySelectorAll(arguments[0]).length,
+    document.readyState,
+    window.__glamResources
+];
+"""
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+
+def lean_blocked_urls():
+    patterns = list(LEAN_BLOCK_URLS)
+    for resource_type in LEAN_BLOCK_TYPES:
+        patterns.extend(BLOCKED_RESOURCE_PATTERNS.get(resource_type.strip(), []))
+    return patterns
+
+
+def init_driver(lean=None):
+    lean = LEAN_MODE if lean is None else lean
     options = Options()
     options.add_argument("--headless=new")
     options.add_argument("--start-maximized")
@@ -26,14 +116,101 @@ def init_driver():
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64)")
 
+    if lean:
+        # Return from driver.get() at DOMContentLoaded; wait_for_cards handles the rest
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
     driver = webdriver.Chrome(service=Service(CHROMEDRIVER_PATH), options=options)
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+
+    if lean:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": lean_blocked_urls()})
+        except Exception as e:
+            logger.warning(f"Could not block heavy resources: {e}")
+
     driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
     return driver
 
 
+def get_driver_pool():
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool(init_driver, size=DRIVER_POOL_SIZE, max_uses=DRIVER_MAX_USES)
+            atexit.register(_driver_pool.shutdown)
+    return _driver_pool
+
+
+class ScrapeCancelled(Exception):
+    """Raised inside a site scraper once its query has been cancelled."""
+
+
+def open_page(driver, url, cancel=None):
+    """
+    Load `url`, checking `cancel` before and after. A load already in flight
+    cannot be interrupted, so a cancelled scrape can still hold its driver
+    for up to SCRAPER_PAGE_LOAD_TIMEOUT.
+    """
+    if cancel is not None and cancel.is_set():
+        raise ScrapeCancelled(url)
+    try:
+        driver.get(url)
+    except TimeoutException:
+        # Slow third-party assets can hold the load event; the DOM is usually usable
+        driver.execute_script("window.stop();")
+    if cancel is not None and cancel.is_set():
+        raise ScrapeCancelled(url)
+
+
 def scroll_page(driver):
     driver.execute_script("window.scrollTo(0, document.body.scrollHeight)")
-    time.sleep(2)
+
+
+def wait_for_cards(driver, site, css, needed, scrolls=1, cancel=None):
+    """
+    Return as soon as `needed` cards matching `css` are on the page, or once the
+    network has gone idle with no scrolls left to trigger lazy loading.
+    Never waits past the site's deadline. Returns the number of cards seen.
+    Raises ScrapeCancelled as soon as the `cancel` event is set.
+    """
+    deadline = time.monotonic() + SITE_WAIT_DEADLINES[site]
+    last_resources, last_change = -1, time.monotonic()
+    scrolled = False
+    count = 0
+
+    while True:
+        if cancel is not None and cancel.is_set():
+            raise ScrapeCancelled(site)
+
+        try:
+            count, ready_state, resources = driver.execute_script(READINESS_JS, css)
+        except Exception:
+            ready_state, resources = "loading", last_resources
+
+        now = time.monotonic()
+        if resources != last_resources:
+            last_resources, last_change = resources, now
+
+        if count >= needed and (scrolled or scrolls == 0):
+            return count
+        if now >= deadline:
+            return count
+
+        # Scroll at least once so lazy-loaded card images get their src
+        idle = ready_state == "complete" and now - last_change >= NETWORK_IDLE_SECONDS
+        if scrolls > 0 and (idle or count >= needed):
+            scroll_page(driver)
+            scrolls -= 1
+            scrolled = True
+            last_change = now
+        elif idle:
+            return count
+
+        time.sleep(WAIT_POLL_SECONDS)
 
 
 def safe_text(element, css):
@@ -69,231 +246,440 @@ def safe_link(element, css, base=""):
         return ""
 
 
-def scrape_myntra(keyword, max_products=10):
-    driver = init_driver()
-    results = []
+def extract_cards(driver, script, css, limit=None):
+    """
+    Read every card on the page in a single execute_script round trip.
+    Returns a list of raw field dicts, or None when the script fails so the
+    caller can fall back to per-field WebDriver lookups.
+    """
     try:
-        driver.get(f"https://www.myntra.com/{keyword.replace(' ', '-')}")
-        time.sleep(3)
-        scroll_page(driver)
-        cards = driver.find_elements(By.CSS_SELECTOR, "li.product-base")
-        for card in cards[:max_products]:
-            results.append({
-                "brand": safe_text(card, "h3.product-brand"),
-                "name": safe_text(card, "h4.product-product"),
-                "price": safe_text(card, "span.product-discountedPrice"),
-                "image": get_image(card),
-                "link": safe_link(card, "a"),
-                "source": "myntra"
-            })
-    finally:
-        driver.quit()
-    return results
+        cards = driver.execute_script(CARD_HELPERS_JS + script, css, limit)
+    except Exception as e:
+        logger.info(f"Batched card extraction failed, falling back: {e}")
+        return None
+    return cards if isinstance(cards, list) else None
 
 
-def scrape_amazon(keyword, max_products=10):
-    driver = init_driver()
+def collect_products(raw_cards, build, max_products):
     results = []
-    try:
-        driver.get(f"https://www.amazon.in/s?k={keyword.replace(' ', '+')}")
-        time.sleep(3)
-        scroll_page(driver)
-        cards = driver.find_elements(By.CSS_SELECTOR, "div[data-component-type='s-search-result']")
-        for card in cards:
-            name = safe_text(card, "h2 span")
-            price = safe_text(card, "span.a-price-whole")
-            if name == "-" or price == "-":
-                continue
-            results.append({
-                "brand": name.split()[0],
-                "name": name,
-                "price": f"₹{price}",
-                "image": get_image(card),
-                "link": safe_link(card, "h2 a", "https://www.amazon.in"),
-                "source": "amazon"
-            })
-            if len(results) >= max_products:
-                break
-    finally:
-        driver.quit()
+    for raw in raw_cards:
+        # One malformed card must not cost the whole site
+        try:
+            product = build(raw) if raw else None
+        except Exception as e:
+            logger.info(f"Skipping unreadable card: {e}")
+            continue
+        if not product:
+            continue
+        results.append(product)
+        if len(results) >= max_products:
+            break
     return results
 
 
-def scrape_flipkart(keyword, max_products=10):
-    driver = init_driver()
-    results = []
+# ─────────────────────────────────────────────
+# MYNTRA
+# ─────────────────────────────────────────────
+MYNTRA_CARD = "li.product-base"
+MYNTRA_JS = """
+return cards.slice(0, arguments[1]).map(card => ({
+    brand: text(card, "h3.product-brand"),
+    name: text(card, "h4.product-product"),
+    price: text(card, "span.product-discountedPrice"),
+    image: image(card),
+    link: link(card, "a")
+}));
+"""
+
+
+def read_myntra_card(card):
+    return {
+        "brand": safe_text(card, "h3.product-brand"),
+        "name": safe_text(card, "h4.product-product"),
+        "price": safe_text(card, "span.product-discountedPrice"),
+        "image": get_image(card),
+        "link": safe_link(card, "a"),
+    }
+
+
+def build_myntra_product(raw):
+    if not (raw["name"] or "").strip():
+        return None
+    return Product.create(
+        "myntra",
+        raw["name"],
+        raw["price"],
+        raw["image"],
+        raw["link"],
+        brand=raw["brand"],
+    )
+
+
+def scrape_myntra(keyword, max_products=10, cancel=None):
+    with get_driver_pool().checkout() as driver:
+        open_page(driver, f"https://www.myntra.com/{keyword.replace(' ', '-')}", cancel=cancel)
+        wait_for_cards(driver, "myntra", MYNTRA_CARD, max_products, cancel=cancel)
+
+        raw_cards = extract_cards(driver, MYNTRA_JS, MYNTRA_CARD, max_products)
+        if raw_cards is None:
+            cards = driver.find_elements(By.CSS_SELECTOR, MYNTRA_CARD)
+            raw_cards = (read_myntra_card(card) for card in cards[:max_products])
+
+        return collect_products(raw_cards, build_myntra_product, max_products)
+
+
+# ─────────────────────────────────────────────
+# AMAZON
+# ─────────────────────────────────────────────
+AMAZON_CARD = "div[data-component-type='s-search-result']"
+AMAZON_JS = """
+return cards.map(card => ({
+    name: text(card, "h2 span"),
+    price: text(card, "span.a-price-whole"),
+    image: image(card),
+    link: link(card, "h2 a")
+}));
+"""
+
+
+def read_amazon_card(card):
+    name = safe_text(card, "h2 span")
+    price = safe_text(card, "span.a-price-whole")
+    if name == "-" or price == "-":
+        return None
+    return {
+        "name": name,
+        "price": price,
+        "image": get_image(card),
+        "link": safe_link(card, "h2 a"),
+    }
+
+
+def build_amazon_product(raw):
+    name, price = (raw["name"] or "").strip(), raw["price"]
+    if not name or name == "-" or price == "-":
+        return None
+    link = raw["link"]
+    return Product.create(
+        "amazon",
+        name,
+        f"₹{price}",
+        raw["image"],
+        "https://www.amazon.in" + link if link and link.startswith("/") else link,
+        brand=name.split()[0],
+    )
+
+
+def scrape_amazon(keyword, max_products=10, cancel=None):
+    with get_driver_pool().checkout() as driver:
+        open_page(driver, f"https://www.amazon.in/s?k={keyword.replace(' ', '+')}", cancel=cancel)
+        # Sponsored / price-less cards get skipped, so wait for a few spare
+        wait_for_cards(driver, "amazon", AMAZON_CARD, max_products + 5, cancel=cancel)
+
+        raw_cards = extract_cards(driver, AMAZON_JS, AMAZON_CARD)
+        if raw_cards is None:
+            cards = driver.find_elements(By.CSS_SELECTOR, AMAZON_CARD)
+            raw_cards = (read_amazon_card(card) for card in cards)
+
+        return collect_products(raw_cards, build_amazon_product, max_products)
+
+
+# ─────────────────────────────────────────────
+# FLIPKART
+# ─────────────────────────────────────────────
+FLIPKART_CARD = "div[data-id]"
+FLIPKART_JS = """
+return cards.map(card => {
+    const a = card.querySelector("a.GnxRXv");
+    const img = card.querySelector("img.UCc1lI");
+    if (!a || !img) return null;
+
+    // First ₹ amount in the card text is usually the discounted price
+    let price = "-";
+    for (const line of card.innerText.split("\\n")) {
+        const match = line.includes("₹") ? line.match(/₹(\\d+)/) : null;
+        if (match) { price = "₹" + match[1]; break; }
+    }
+    return {name: img.getAttribute("alt") || "-", price: price, image: image(card), link: a.href || ""};
+});
+"""
+
+
+def read_flipkart_card(container):
     try:
-        driver.get(f"https://www.flipkart.com/search?q={keyword}")
-        time.sleep(6)
-        try:
-            driver.find_element(By.XPATH, "//button[contains(text(),'✕')]").click()
-        except:
-            pass
-        
-        for _ in range(3):
-            scroll_page(driver)
+        # Get the link which contains product details
+        link_elem = container.find_element(By.CSS_SELECTOR, "a.GnxRXv")
+        link_href = link_elem.get_attribute("href")
+
+        # The product name is in the alt text of the image
+        img = container.find_element(By.CSS_SELECTOR, "img.UCc1lI")
+        name = img.get_attribute("alt") or "-"
+
+        # Price - take the first ₹ amount (usually the discounted one)
+        price = "-"
+        for line in container.text.split('\n'):
+            matches = re.findall(r'₹(\d+)', line) if '₹' in line else []
+            if matches:
+                price = f"₹{matches[0]}"
+                break
 
-        # Wait for products to load
-        wait = WebDriverWait(driver, 10)
-        wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "div[data-id]")))
+        return {"name": name, "price": price, "image": get_image(container), "link": link_href}
+    except Exception:
+        return None
 
-        # Find all product containers with data-id
-        product_containers = driver.find_elements(By.CSS_SELECTOR, "div[data-id]")
-        
-        for container in product_containers:
-            try:
-                # Get the link which contains product details
-                link_elem = container.find_element(By.CSS_SELECTOR, "a.GnxRXv")
-                
-                # Extract href
-                link_href = link_elem.get_attribute("href")
-                
-                # The product name is in the alt text of the image
-                img = container.find_element(By.CSS_SELECTOR, "img.UCc1lI")
-                name = img.get_attribute("alt") or "-"
-                
-                # Extract the main product name (first part before "with" or "for")
-                if name != "-":
-                    # Clean up the name
-                    name = name.split("with")[0].strip()
-                
-                # Price - get all text and find the price
-                all_text = container.text
-                price = "-"
-                
-                # Extract price from text (look for ₹ symbol)
-                lines = all_text.split('\n')
-                for line in lines:
-                    if '₹' in line:
-                        # Extract price numbers
-                        import re
-                        matches = re.findall(r'₹(\d+)', line)
-                        if matches:
-                            # Take the first price (usually the discounted one)
-                            price = f"₹{matches[0]}"
-                            break
-                
-                if name == "-" or price == "-":
-                    continue
-
-                results.append({
-                    "brand": name.split()[0] if name != "-" else "-",
-                    "name": name,
-                    "price": price,
-                    "image": get_image(container),
-                    "link": f"https://www.flipkart.com{link_href}" if link_href and link_href.startswith("/") else link_href,
-                    "source": "flipkart"
-                })
-
-                if len(results) >= max_products:
-                    break
-            except Exception as e:
-                continue
 
-    except Exception as e:
-        pass
-    finally:
-        driver.quit()
-    return results
+def build_flipkart_product(raw):
+    name, price = raw["name"], raw["price"]
 
+    # Extract the main product name (first part before "with")
+    if name != "-":
+        name = (name or "").split("with")[0].strip()
+
+    if not name or name == "-" or price == "-":
+        return None
+
+    link_href = raw["link"]
+    return Product.create(
+        "flipkart",
+        name,
+        price,
+        raw["image"],
+        f"https://www.flipkart.com{link_href}" if link_href and link_href.startswith("/") else link_href,
+        brand=name.split()[0],
+    )
 
-def scrape_nykaa(keyword, max_products=10):
-    driver = init_driver()
-    results = []
-    try:
-        driver.get(f"https://www.nykaa.com/search/result/?q={keyword}")
-        time.sleep(8)
-        
-        for _ in range(3):
-            scroll_page(driver)
 
-        # Find product wrapper containers
-        products = driver.find_elements(By.CSS_SELECTOR, "div.productWrapper")
-        
-        for product in products:
+def scrape_flipkart(keyword, max_products=10, cancel=None):
+    with get_driver_pool().checkout() as driver:
+        try:
+            open_page(driver, f"https://www.flipkart.com/search?q={keyword}", cancel=cancel)
+
+            # Wait for products to load
+            wait_for_cards(driver, "flipkart", FLIPKART_CARD, max_products + 5, scrolls=3, cancel=cancel)
             try:
-                # Get the product link
-                link_elem = product.find_element(By.CSS_SELECTOR, "a.css-qlopj4")
-                link_href = link_elem.get_attribute("href")
-                
-                # Get product name from the link or the title div
-                name = "-"
-                try:
-                    name_elem = product.find_element(By.CSS_SELECTOR, "div.css-xrzmfa")
-                    name = name_elem.text.strip()
-                except:
-                    pass
-                
-                # Get brand - try to extract from name or find brand element
-                brand = "-"
-                if name != "-":
-                    # Brand is usually the first word
-                    brand = name.split()[0]
-                
-                # Get price - look for the discounted price
-                price = "-"
-                try:
-                    price_elem = product.find_element(By.CSS_SELECTOR, "span.css-111z9ua")
-                    price = price_elem.text.strip()
-                except:
-                    try:
-                        price_elem = product.find_element(By.CSS_SELECTOR, "span.css-17x46n5 span")
-                        price = price_elem.text.strip()
-                    except:
-                        pass
-                
-                if name == "-" or price == "-":
-                    continue
-
-                results.append({
-                    "brand": brand,
-                    "name": name,
-                    "price": price,
-                    "image": get_image(product),
-                    "link": f"https://www.nykaa.com{link_href}" if link_href and link_href.startswith("/") else link_href,
-                    "source": "nykaa"
-                })
-
-                if len(results) >= max_products:
-                    break
-
-            except Exception as e:
-                continue
+                driver.find_element(By.XPATH, "//button[contains(text(),'✕')]").click()
+            except:
+                pass
 
-    except Exception as e:
-        pass
-    finally:
-        driver.quit()
-    return results
+            raw_cards = extract_cards(driver, FLIPKART_JS, FLIPKART_CARD)
+            if raw_cards is None:
+                containers = driver.find_elements(By.CSS_SELECTOR, FLIPKART_CARD)
+                raw_cards = (read_flipkart_card(container) for container in containers)
 
+            return collect_products(raw_cards, build_flipkart_product, max_products)
 
-if __name__ == "__main__":
-    keyword = sys.argv[1] if len(sys.argv) > 1 else "blush"
+        except Exception as e:
+            return []
+
+
+# ─────────────────────────────────────────────
+# NYKAA
+# ─────────────────────────────────────────────
+NYKAA_CARD = "div.productWrapper"
+NYKAA_JS = """
+return cards.map(card => {
+    const a = card.querySelector("a.css-qlopj4");
+    if (!a) return null;
+
+    // Discounted price, falling back to the single-price layout
+    let price = text(card, "span.css-111z9ua");
+    if (price === "-") price = text(card, "span.css-17x46n5 span");
+    return {name: text(card, "div.css-xrzmfa"), price: price, image: image(card), link: a.href || ""};
+});
+"""
 
+
+def read_nykaa_card(product):
     try:
-        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-            futures = {
-                executor.submit(scrape_myntra, keyword): "myntra",
-                executor.submit(scrape_flipkart, keyword): "flipkart",
-                executor.submit(scrape_nykaa, keyword): "nykaa",
-                executor.submit(scrape_amazon, keyword): "amazon",
-            }
+        link_href = product.find_element(By.CSS_SELECTOR, "a.css-qlopj4").get_attribute("href")
+    except Exception:
+        return None
+
+    # Get price - look for the discounted price
+    price = safe_text(product, "span.css-111z9ua")
+    if price == "-":
+        price = safe_text(product, "span.css-17x46n5 span")
+
+    return {
+        "name": safe_text(product, "div.css-xrzmfa"),
+        "price": price,
+        "image": get_image(product),
+        "link": link_href,
+    }
+
+
+def build_nykaa_product(raw):
+    name, price = (raw["name"] or "").strip(), raw["price"]
+    if not name or name == "-" or price == "-":
+        return None
+
+    link_href = raw["link"]
+    return Product.create(
+        "nykaa",
+        name,
+        price,
+        raw["image"],
+        f"https://www.nykaa.com{link_href}" if link_href and link_href.startswith("/") else link_href,
+        # Brand is usually the first word
+        brand=name.split()[0],
+    )
+
+
+def scrape_nykaa(keyword, max_products=10, cancel=None):
+    with get_driver_pool().checkout() as driver:
+        try:
+            open_page(driver, f"https://www.nykaa.com/search/result/?q={keyword}", cancel=cancel)
+            wait_for_cards(driver, "nykaa", NYKAA_CARD, max_products + 5, scrolls=3, cancel=cancel)
+
+            raw_cards = extract_cards(driver, NYKAA_JS, NYKAA_CARD)
+            if raw_cards is None:
+                products = driver.find_elements(By.CSS_SELECTOR, NYKAA_CARD)
+                raw_cards = (read_nykaa_card(product) for product in products)
+
+            return collect_products(raw_cards, build_nykaa_product, max_products)
+
+        except Exception as e:
+            return []
+
+
+SCRAPERS = {
+    "myntra": scrape_myntra,
+    "flipkart": scrape_flipkart,
+    "nykaa": scrape_nykaa,
+    "amazon": scrape_amazon,
+}
+SITES = list(SCRAPERS)
+
+BUILDERS = {
+    "myntra": build_myntra_product,
+    "flipkart": build_flipkart_product,
+    "nykaa": build_nykaa_product,
+    "amazon": build_amazon_product,
+}
+
+
+class TierStats:
+    """
+    Counts and wall time per (site, tier) — shows how much browser time the
+    HTTP tier saves. "http_fallback" is time spent on HTTP attempts that did
+    not yield a full page, which is paid on top of the browser scrape.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, site, tier, seconds):
+        with self._lock:
+            entry = self._stats.setdefault(site, {
+                "http": 0, "browser": 0, "http_fallback": 0,
+                "http_seconds": 0.0, "browser_seconds": 0.0, "http_fallback_seconds": 0.0,
+            })
+            entry[tier] += 1
+            entry[f"{tier}_seconds"] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {}
+            for site, entry in self._stats.items():
+                avg_browser = entry["browser_seconds"] / entry["browser"] if entry["browser"] else 0.0
+                avg_http = entry["http_seconds"] / entry["http"] if entry["http"] else 0.0
+                snapshot[site] = {
+                    **entry,
+                    "browser_seconds_saved": round(
+                        entry["http"] * max(avg_browser - avg_http, 0.0) - entry["http_fallback_seconds"], 2
+                    ),
+                }
+            return snapshot
+
+
+tier_stats = TierStats()
+
+
+def empty_results():
+    return {site: [] for site in SITES}
+
+
+def scrape_site(site, keyword, max_products=10, cancel=None):
+    """
+    Serve a site from the plain-HTTP tier when its parse yields a full page of
+    products, otherwise fall back to a pooled Chrome session.
+    """
+    if HTTP_TIER_ENABLED and site in http_fetcher.HTTP_TIER_SITES:
+        started = time.monotonic()
+        try:
+            products = collect_products(http_fetcher.fetch_cards(site, keyword), BUILDERS[site], max_products)
+        except Exception as e:
+            logger.info(f"[HTTP TIER] {site} failed, using the browser: {e}")
+            products = []
+        if len(products) >= max_products:
+            tier_stats.record(site, "http", time.monotonic() - started)
+            return products
+        tier_stats.record(site, "http_fallback", time.monotonic() - started)
+
+    if cancel is not None and cancel.is_set():
+        raise ScrapeCancelled(site)
+
+    started = time.monotonic()
+    products = SCRAPERS[site](keyword, max_products, cancel)
+    tier_stats.record(site, "browser", time.monotonic() - started)
+    return products
+
+
+def submit_sites(keyword, executor, max_products=10, sites=None, cancel=None):
+    """
+    Start one scrape job per site on `executor`; returns {future: site}.
+    Setting the optional `cancel` event makes running scrapers bail out.
+    """
+    return {
+        executor.submit(scrape_site, site, keyword, max_products, cancel): site
+        for site in sites or SITES
+    }
+
+
+def cancel_sites(futures, cancel):
+    """Stop unfinished site jobs: drop queued ones, signal running ones."""
+    cancel.set()
+    for future in futures:
+        future.cancel()
+
+
+def iter_scrape(keyword, executor, max_products=10, sites=None):
+    """Yield (site, products) as each site finishes; a failed site yields []."""
+    futures = submit_sites(keyword, executor, max_products, sites)
+
+    for future in concurrent.futures.as_completed(futures):
+        site = futures[future]
+        try:
+            yield site, future.result()
+        except:
+            yield site, []
 
-            results = {k: [] for k in ["myntra", "flipkart", "nykaa", "amazon"]}
 
-            for future in concurrent.futures.as_completed(futures):
-                site = futures[future]
-                try:
-                    results[site] = future.result()
-                except:
-                    results[site] = []
+def scrape_all(keyword, executor, max_products=10, sites=None):
+    """Fan one keyword out to `sites` (default: all) on `executor`."""
+    results = {site: [] for site in sites or SITES}
+    for site, products in iter_scrape(keyword, executor, max_products, sites):
+        results[site] = products
+    return results
+
 
-        print(json.dumps(results))
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("keyword", nargs="?", default="blush")
+    parser.add_argument("--stream", action="store_true",
+                        help="print one NDJSON record per site as soon as it finishes")
+    args = parser.parse_args()
+
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(SITES)) as executor:
+            if args.stream:
+                for site, products in iter_scrape(args.keyword, executor):
+                    print(json.dumps({"site": site, "products": to_dicts(products)}), flush=True)
+            else:
+                print(json.dumps({site: to_dicts(products) for site, products in scrape_all(args.keyword, executor).items()}))
 
     except:
-        print(json.dumps({
-            "myntra": [],
-            "flipkart": [],
-            "nykaa": [],
-            "amazon": []
-        }))
\ No newline at end of file
+        # Streamed records already on stdout stand on their own
+        if not args.stream:
+            print(json.dumps(empty_results()))
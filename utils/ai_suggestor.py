@@ -1,48 +1,138 @@
-from ollama import Client
+import re
+import json
 
-def generate_suggestions(query: str, model: str = "mistral", count: int = 5) -> list:
-    client = Client()
+from utils.llm_cache import get_llm_cache
+from utils.llm_gateway import INTERACTIVE, NORMAL
+from utils.model_manager import get_model_manager
+from utils.prompt_builder import build_prompt, matched_set_lines
+
+JSON_OBJECT_RE = re.compile(r"\{.*\}", re.S)
+
+def stream_chat(prompt: str, task: str, priority: int = NORMAL):
+    """
+    Yield the reply to `prompt` piece by piece as the task's model writes it.
+    A cached reply is yielded whole; a completed stream is cached.
+    """
+    models = get_model_manager()
+    model = models.model_for(task)
+    cache = get_llm_cache()
+    cached = cache.get(model, task, prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for chunk in models.stream("chat", task, priority, messages=[{"role": "user", "content": prompt}]):
+        piece = chunk["message"]["content"]
+        parts.append(piece)
+        yield piece
+
+    text = "".join(parts).strip()
+    if text:
+        cache.set(model, task, prompt, text)
+
+def generate_suggestions(query: str, count: int = 5) -> list:
+    models = get_model_manager()
     prompt = f"""
     Based on the user’s interest in "{query}", suggest {count} related beauty product search phrases.
     Keep them under 6 words, consumer-friendly, and diverse.
     """
+
+    def ask():
+        response = models.chat("suggestions", messages=[{"role": "user", "content": prompt}], priority=NORMAL)
+        return clean_suggestions(response["message"]["content"].strip().split("\n"))
+
     try:
-        response = client.chat(model=model, messages=[{"role": "user", "content": prompt}])
-        suggestions = response["message"]["content"].strip().split("\n")
-        return [s.strip("-•1234567890. ").strip() for s in suggestions if len(s.strip()) > 3]
+        return get_llm_cache().cached(models.model_for("suggestions"), "suggestions", prompt, ask)
     except Exception as e:
         print("Ollama error (suggestions):", e)
         return []
 
-def generate_comparison_summary(matched_products: list, model: str = "mistral") -> str:
-    client = Client()
-    prompt = f"""
+def clean_suggestions(lines) -> list:
+    return [s.strip("-•1234567890. ").strip() for s in lines if len(s.strip()) > 3]
+
+def parse_insights(text: str, count: int = 5):
+    """
+    {"summary": str, "suggestions": [str]} from a model's JSON reply, or None
+    if it is not usable. Tolerates prose or code fences around the object.
+    """
+    match = JSON_OBJECT_RE.search(text or "")
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    summary = data.get("summary")
+    suggestions = data.get("suggestions")
+    if isinstance(suggestions, str):
+        suggestions = suggestions.split("\n")
+    if not isinstance(summary, str) or not summary.strip() or not isinstance(suggestions, list):
+        return None
+
+    suggestions = clean_suggestions(s for s in suggestions if isinstance(s, str))
+    if not suggestions:
+        return None
+    return {"summary": summary.strip(), "suggestions": suggestions[:count]}
+
+def comparison_summary_prompt(matched_products: list) -> str:
+    return build_prompt("comparison_summary", lambda body: f"""
     You are an expert beauty advisor.
 
     Given the following matched product sets from different sites, summarize their similarities and differences briefly.
     Don't list prices or links—just do a qualitative comparison as if advising a user.
 
-    Matched Sets:
-    {matched_products}
+    {body}
 
     Return the summary in 2-3 sentences.
-    """
-    try:
-        response = client.chat(model=model, messages=[{"role": "user", "content": prompt}])
+    """, {"Matched sets": matched_set_lines(matched_products)}, sep="\n    - ")
+
+def generate_comparison_summary(matched_products: list) -> str:
+    models = get_model_manager()
+    prompt = comparison_summary_prompt(matched_products)
+
+    def ask():
+        response = models.chat("comparison_summary", messages=[{"role": "user", "content": prompt}], priority=NORMAL)
         return response["message"]["content"].strip()
+
+    try:
+        return get_llm_cache().cached(models.model_for("comparison_summary"), "comparison_summary", prompt, ask)
     except Exception as e:
         print("Ollama error (comparison):", e)
         return "AI comparison could not be generated."
-def compare_products(product1: str, product2: str, model: str = "mistral") -> str:
-    client = Client()
-    prompt = f"""
+
+def compare_products_prompt(product1: str, product2: str) -> str:
+    return f"""
     You are an expert beauty advisor.
     Compare these two products: "{product1}" and "{product2}".
     Give a brief qualitative comparison in 2-3 sentences as if advising a user.
     """
-    try:
-        response = client.chat(model=model, messages=[{"role": "user", "content": prompt}])
+
+def compare_products(product1: str, product2: str) -> str:
+    models = get_model_manager()
+    prompt = compare_products_prompt(product1, product2)
+
+    def ask():
+        response = models.chat("compare_products", messages=[{"role": "user", "content": prompt}], priority=INTERACTIVE)
         return response["message"]["content"].strip()
+
+    try:
+        return get_llm_cache().cached(models.model_for("compare_products"), "compare_products", prompt, ask)
     except Exception as e:
         print("Ollama error (compare_products):", e)
         return "AI comparison could not be generated."
+
+def compare_products_stream(product1: str, product2: str):
+    """Like `compare_products`, but yields the comparison as it is generated."""
+    streamed = False
+    try:
+        for piece in stream_chat(compare_products_prompt(product1, product2), "compare_products", INTERACTIVE):
+            streamed = True
+            yield piece
+    except Exception as e:
+        print("Ollama error (compare_products stream):", e)
+        if not streamed:
+            yield "AI comparison could not be generated."
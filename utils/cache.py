@@ -0,0 +1,141 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from utils.logger import logger
+
+
+class TieredCache:
+    """
+    Two-tier key/value cache: an in-memory LRU in front of a SQLite table.
+
+    Values must be JSON-serialisable. Both tiers are size bounded; the disk
+    tier evicts the least recently accessed rows. Freshness is left to the
+    caller — `get` returns the value together with the time it was stored.
+    """
+
+    def __init__(self, db_path, table, max_memory=256, max_disk=5000):
+        self.db_path = db_path
+        self.table = table
+        self.max_memory = max_memory
+        self.max_disk = max_disk
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = {"memory": 0, "disk": 0, "miss": 0}
+        self._init_db()
+
+    # ─────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────
+    def get(self, key):
+        """Return (value, stored_at) or None."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._hits["memory"] += 1
+                return entry
+
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is None:
+                self._hits["miss"] += 1
+                return None
+            self._hits["disk"] += 1
+            self._remember(key, entry)
+        return entry
+
+    def set(self, key, value, stored_at=None):
+        entry = (value, stored_at or time.time())
+        with self._lock:
+            self._remember(key, entry)
+        self._disk_set(key, entry)
+
+    def delete(self, key):
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            with self._connect() as conn:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] delete failed for {self.table}: {e}")
+
+    def stats(self):
+        with self._lock:
+            return {"memory_entries": len(self._memory), **self._hits}
+
+    # ─────────────────────────────────────────────
+    # MEMORY TIER
+    # ─────────────────────────────────────────────
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory:
+            self._memory.popitem(last=False)
+
+    # ─────────────────────────────────────────────
+    # DISK TIER
+    # ─────────────────────────────────────────────
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {self.table} (
+                        key TEXT PRIMARY KEY,
+                        value TEXT NOT NULL,
+                        stored_at REAL NOT NULL,
+                        accessed_at REAL NOT NULL
+                    )
+                """)
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)"
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"[CACHE] disk tier unavailable for {self.table}: {e}")
+
+    def _disk_get(self, key):
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                conn.execute(
+                    f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+                )
+            return json.loads(row[0]), row[1]
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"[CACHE] read failed for {self.table}: {e}")
+            return None
+
+    def _disk_set(self, key, entry):
+        value, stored_at = entry
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), stored_at, time.time())
+                )
+                overflow = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0] - self.max_disk
+                if overflow > 0:
+                    conn.execute(
+                        f"DELETE FROM {self.table} WHERE key IN "
+                        f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                        (overflow,)
+                    )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"[CACHE] write failed for {self.table}: {e}")
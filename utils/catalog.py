@@ -0,0 +1,277 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+
+from utils.logger import logger
+
+CATALOG_DB = os.getenv("CATALOG_DB", "catalog.db")
+CATALOG_ENABLED = os.getenv("PRODUCT_CATALOG", "1") == "1"
+HOT_SET_SIZE = int(os.getenv("CATALOG_HOT_SET", "4096"))
+
+# Listings not seen in a confirmed group for this long are forgotten (default 30 days)
+CATALOG_TTL = int(os.getenv("CATALOG_TTL", str(30 * 24 * 3600)))
+CATALOG_MAX_ROWS = int(os.getenv("CATALOG_MAX_ROWS", "200000"))
+
+# SQLite's default limit on bound parameters is 999
+SQL_CHUNK = 500
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+class ProductCatalog:
+    """
+    Persistent cross-query product identity.
+
+    Every listing that has been part of a confirmed cross-site group maps to
+    a canonical product id, both by its Product id (site + listing id) and by
+    (site, normalized name). Lookups hit an in-memory LRU hot set first and
+    SQLite after that, so known products resolve without any fuzzy matching.
+
+    A listing's `seen_at` is refreshed every time it is recorded again. Rows
+    older than `ttl` are ignored and pruned on the next write, and the table
+    is capped at `max_rows` (oldest first); `invalidate` drops entries early.
+    """
+
+    def __init__(self, db_path=CATALOG_DB, max_memory=HOT_SET_SIZE, ttl=CATALOG_TTL, max_rows=CATALOG_MAX_ROWS):
+        self.db_path = db_path
+        self.max_memory = max_memory
+        self.ttl = ttl
+        self.max_rows = max_rows
+
+        self._hot = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hot": 0, "disk": 0, "miss": 0, "recorded": 0, "pruned": 0}
+        self._init_db()
+
+    @staticmethod
+    def _id_key(product_id):
+        return f"id:{product_id}"
+
+    @staticmethod
+    def _name_key(site, normalized):
+        return f"name:{site}:{normalized}"
+
+    # ─────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────
+    def resolve_many(self, products):
+        """
+        {product.id: canonical id} for every product the catalog knows. The
+        (site, name) fallback is only used for names that appear once per site
+        in `products` — otherwise it cannot tell which listing is meant.
+        """
+        resolved = {}
+        unresolved = []
+        names = Counter((p.source, p.normalized) for p in products)
+        by_name = {p.id for p in products if p.normalized and names[(p.source, p.normalized)] == 1}
+
+        with self._lock:
+            for p in products:
+                canonical = self._hot_get(self._id_key(p.id))
+                if canonical is None and p.id in by_name:
+                    canonical = self._hot_get(self._name_key(p.source, p.normalized))
+                if canonical is None:
+                    unresolved.append(p)
+                else:
+                    resolved[p.id] = canonical
+            self._stats["hot"] += len(resolved)
+
+        if unresolved:
+            found = self._disk_resolve(unresolved, by_name)
+            with self._lock:
+                self._stats["disk"] += len(found)
+                self._stats["miss"] += len(unresolved) - len(found)
+                for p in unresolved:
+                    if p.id in found:
+                        self._remember(p, *found[p.id])
+            resolved.update((product_id, canonical) for product_id, (canonical, _) in found.items())
+
+        return resolved
+
+    def record_groups(self, groups):
+        """
+        Store the cross-site groups from a match. Members of a group already in
+        the catalog keep its canonical id; new groups take their first member's id.
+        """
+        rows = []
+        for group in groups:
+            members = [p for p in group.values() if p]
+            if len(members) < 2:
+                continue
+
+            known = self.resolve_many(members)
+            canonical = next((known[p.id] for p in members if p.id in known), members[0].id)
+            now = time.time()
+            rows.extend((p.id, p.source, p.normalized, canonical, now) for p in members)
+
+            with self._lock:
+                for p in members:
+                    self._remember(p, canonical, now)
+
+        if not rows:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO catalog_listings "
+                    "(product_id, site, name_key, canonical_id, seen_at) VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                pruned = self._prune(conn)
+            with self._lock:
+                self._stats["recorded"] += len(rows)
+                self._stats["pruned"] += pruned
+        except sqlite3.Error as e:
+            logger.warning(f"[CATALOG] write failed: {e}")
+
+    def invalidate(self, product_ids=None):
+        """
+        Forget the given listings (by Product id), or the whole catalog when
+        `product_ids` is None, e.g. after a site changes its listing ids.
+        """
+        try:
+            with self._connect() as conn:
+                if product_ids is None:
+                    conn.execute("DELETE FROM catalog_listings")
+                else:
+                    product_ids = list(product_ids)
+                    for start in range(0, len(product_ids), SQL_CHUNK):
+                        chunk = product_ids[start:start + SQL_CHUNK]
+                        conn.execute(
+                            f"DELETE FROM catalog_listings WHERE product_id IN ({','.join('?' * len(chunk))})",
+                            chunk
+                        )
+        except sqlite3.Error as e:
+            logger.warning(f"[CATALOG] invalidate failed: {e}")
+
+        # Name keys in the hot set are not tied to a product id; drop them all
+        with self._lock:
+            if product_ids is None:
+                self._hot.clear()
+            else:
+                for key in [self._id_key(product_id) for product_id in product_ids]:
+                    self._hot.pop(key, None)
+                for key in [key for key in self._hot if key.startswith("name:")]:
+                    del self._hot[key]
+
+    def stats(self):
+        with self._lock:
+            return {"hot_entries": len(self._hot), **self._stats}
+
+    # ─────────────────────────────────────────────
+    # HOT SET
+    # ─────────────────────────────────────────────
+    def _hot_get(self, key):
+        entry = self._hot.get(key)
+        if entry is None:
+            return None
+        canonical, seen_at = entry
+        if time.time() - seen_at > self.ttl:
+            del self._hot[key]
+            return None
+        self._hot.move_to_end(key)
+        return canonical
+
+    def _remember(self, product, canonical, seen_at):
+        keys = [self._id_key(product.id)]
+        if product.normalized:
+            keys.append(self._name_key(product.source, product.normalized))
+        for key in keys:
+            self._hot[key] = (canonical, seen_at)
+            self._hot.move_to_end(key)
+        while len(self._hot) > self.max_memory:
+            self._hot.popitem(last=False)
+
+    # ─────────────────────────────────────────────
+    # DISK
+    # ─────────────────────────────────────────────
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS catalog_listings (
+                        product_id TEXT PRIMARY KEY,
+                        site TEXT NOT NULL,
+                        name_key TEXT NOT NULL,
+                        canonical_id TEXT NOT NULL,
+                        seen_at REAL NOT NULL
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_catalog_site_name ON catalog_listings (site, name_key)"
+                )
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_catalog_seen ON catalog_listings (seen_at)"
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"[CATALOG] unavailable: {e}")
+
+    def _prune(self, conn):
+        """Delete rows past the TTL, then the oldest ones over `max_rows`. Returns how many went."""
+        pruned = conn.execute(
+            "DELETE FROM catalog_listings WHERE seen_at < ?", (time.time() - self.ttl,)
+        ).rowcount
+        overflow = conn.execute("SELECT COUNT(*) FROM catalog_listings").fetchone()[0] - self.max_rows
+        if overflow > 0:
+            pruned += conn.execute(
+                "DELETE FROM catalog_listings WHERE product_id IN "
+                "(SELECT product_id FROM catalog_listings ORDER BY seen_at ASC LIMIT ?)",
+                (overflow,)
+            ).rowcount
+        return pruned
+
+    def _disk_resolve(self, products, by_name):
+        """{product.id: (canonical id, seen_at)} for products with a row inside the TTL."""
+        found = {}
+        cutoff = time.time() - self.ttl
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(products), SQL_CHUNK):
+                    chunk = products[start:start + SQL_CHUNK]
+                    marks = ",".join("?" * len(chunk))
+                    found.update(
+                        (product_id, (canonical, seen_at)) for product_id, canonical, seen_at in conn.execute(
+                            "SELECT product_id, canonical_id, seen_at FROM catalog_listings "
+                            f"WHERE product_id IN ({marks}) AND seen_at >= ?",
+                            [p.id for p in chunk] + [cutoff]
+                        ).fetchall()
+                    )
+
+                # Same name on the same site under a different link (tracking paths, relisting)
+                for p in products:
+                    if p.id in found or p.id not in by_name:
+                        continue
+                    row = conn.execute(
+                        "SELECT canonical_id, seen_at FROM catalog_listings "
+                        "WHERE site = ? AND name_key = ? AND seen_at >= ? ORDER BY seen_at DESC LIMIT 1",
+                        (p.source, p.normalized, cutoff)
+                    ).fetchone()
+                    if row:
+                        found[p.id] = tuple(row)
+        except sqlite3.Error as e:
+            logger.warning(f"[CATALOG] read failed: {e}")
+            return {}
+
+        return {p.id: found[p.id] for p in products if p.id in found}
+
+
+def get_catalog():
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ProductCatalog()
+    return _catalog
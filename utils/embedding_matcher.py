@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+from utils.llm_gateway import get_llm_gateway
+from utils.logger import logger
+
+try:
+    import numpy as np
+except ImportError:  # optional backend — needs numpy
+    np = None
+
+EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
+EMBEDDING_DB = os.getenv("EMBEDDING_DB", "embeddings.db")
+EMBED_BATCH = 64
+ROW_CHUNK = 1024
+
+# Cosine similarity above which two names count as the same product
+DEFAULT_THRESHOLD = float(os.getenv("EMBED_MATCH_THRESHOLD", "0.88"))
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def name_hash(model, text):
+    return hashlib.sha1(f"{model}\0{text}".encode()).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Unit-length name embeddings from a local Ollama model, cached in memory
+    and in SQLite by (model, name) hash so a name is only ever embedded once.
+    """
+
+    def __init__(self, model=EMBED_MODEL, db_path=EMBEDDING_DB, client=None):
+        self.model = model
+        self.db_path = db_path
+        self.client = client or get_llm_gateway()
+
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._stats = {"memory": 0, "disk": 0, "embedded": 0}
+        self._init_db()
+
+    def embed(self, texts):
+        """(len(texts), dim) float32 matrix of L2-normalised embeddings."""
+        keys = [name_hash(self.model, t) for t in texts]
+        vectors = {}
+
+        with self._lock:
+            for key in keys:
+                if key in self._memory:
+                    vectors[key] = self._memory[key]
+            self._stats["memory"] += len(vectors)
+
+        missing = list(dict.fromkeys(k for k in keys if k not in vectors))
+        if missing:
+            found = self._disk_get(missing)
+            vectors.update(found)
+            with self._lock:
+                self._stats["disk"] += len(found)
+                self._memory.update(found)
+
+        texts_by_key = dict(zip(keys, texts))
+        new_keys = [k for k in missing if k not in vectors]
+        for start in range(0, len(new_keys), EMBED_BATCH):
+            batch = new_keys[start:start + EMBED_BATCH]
+            response = self.client.embed(model=self.model, input=[texts_by_key[k] for k in batch])
+            embedded = {}
+            for key, vector in zip(batch, response["embeddings"]):
+                vector = np.asarray(vector, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                embedded[key] = vector / norm if norm else vector
+            vectors.update(embedded)
+            self._disk_set(embedded)
+            with self._lock:
+                self._stats["embedded"] += len(embedded)
+                self._memory.update(embedded)
+
+        return np.vstack([vectors[k] for k in keys])
+
+    def stats(self):
+        with self._lock:
+            return {"memory_entries": len(self._memory), **self._stats}
+
+    # ─────────────────────────────────────────────
+    # DISK
+    # ─────────────────────────────────────────────
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self):
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        vector BLOB NOT NULL
+                    )
+                """)
+        except sqlite3.Error as e:
+            logger.warning(f"[EMBED] disk cache unavailable: {e}")
+
+    def _disk_get(self, keys):
+        found = {}
+        try:
+            with self._connect() as conn:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    marks = ",".join("?" * len(chunk))
+                    for key, blob in conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({marks})", chunk
+                    ):
+                        found[key] = np.frombuffer(blob, dtype=np.float32)
+        except sqlite3.Error as e:
+            logger.warning(f"[EMBED] read failed: {e}")
+        return found
+
+    def _disk_set(self, vectors):
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, vector.tobytes()) for key, vector in vectors.items()]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"[EMBED] write failed: {e}")
+
+
+def get_embedding_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = EmbeddingStore()
+    return _store
+
+
+def cosine_neighbours(vectors, sources, threshold):
+    """
+    Brute-force index over unit vectors: {i: [(j, score), ...]} for every
+    j > i from a different site with cosine similarity above `threshold`.
+    """
+    sources = np.asarray(sources)
+    neighbours = {}
+    n = vectors.shape[0]
+
+    for start in range(0, n, ROW_CHUNK):
+        sims = vectors[start:start + ROW_CHUNK] @ vectors.T
+        rows, cols = np.nonzero(sims > threshold)
+        rows = rows + start
+        keep = (cols > rows) & (sources[rows] != sources[cols])
+        for i, j in zip(rows[keep], cols[keep]):
+            neighbours.setdefault(int(i), []).append((int(j), float(sims[i - start, j])))
+
+    return neighbours
+
+
+def match_embedding(all_products, threshold=DEFAULT_THRESHOLD, store=None):
+    """Neighbour lists for the greedy grouper in utils.matcher, from name embeddings."""
+    if np is None:
+        raise ImportError("The 'embedding' matching backend needs numpy installed.")
+    if not all_products:
+        return {}
+
+    store = store or get_embedding_store()
+    vectors = store.embed([p.normalized or p.name.lower() for p in all_products])
+    return cosine_neighbours(vectors, [p.source for p in all_products], threshold)
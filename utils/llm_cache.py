@@ -0,0 +1,71 @@
+import os
+import time
+import hashlib
+import threading
+
+from utils.cache import TieredCache
+
+LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.db")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MEMORY = int(os.getenv("LLM_CACHE_MEMORY", "512"))
+LLM_CACHE_DISK = int(os.getenv("LLM_CACHE_DISK", "10000"))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Prompts that differ only in case or whitespace/indentation share an entry."""
+    return " ".join((prompt or "").lower().split())
+
+
+class LLMCache:
+    """
+    LLM responses keyed by (model, task, normalized prompt hash), on top of
+    the two-tier memory/SQLite cache. Entries older than `ttl` are ignored.
+    """
+
+    def __init__(self, store=None, ttl=LLM_CACHE_TTL):
+        self.store = store or TieredCache(LLM_CACHE_DB, "llm_responses", max_memory=LLM_CACHE_MEMORY,
+                                          max_disk=LLM_CACHE_DISK)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(model, task, prompt):
+        digest = hashlib.sha256(normalize_prompt(prompt).encode()).hexdigest()
+        return f"{task}:{model}:{digest}"
+
+    def get(self, model, task, prompt):
+        entry = self.store.get(self.key(model, task, prompt))
+        if entry is None:
+            return None
+        value, stored_at = entry
+        return value if time.time() - stored_at <= self.ttl else None
+
+    def set(self, model, task, prompt, value):
+        self.store.set(self.key(model, task, prompt), value)
+
+    def cached(self, model, task, prompt, compute):
+        """
+        Return the cached response, or call `compute()` and cache what it
+        returns. Exceptions propagate and empty responses are not cached, so
+        a failed or blank generation is retried next time.
+        """
+        value = self.get(model, task, prompt)
+        if value is not None:
+            return value
+        value = compute()
+        if value:
+            self.set(model, task, prompt, value)
+        return value
+
+    def stats(self):
+        return self.store.stats()
+
+
+def get_llm_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache()
+    return _cache
@@ -0,0 +1,190 @@
+import os
+import time
+import queue
+import itertools
+import threading
+import concurrent.futures
+from collections import deque
+
+from ollama import Client
+
+from utils.logger import logger
+
+OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
+
+# Generations allowed against the Ollama box at once; the rest wait in the queue
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "2"))
+
+# Default seconds a caller waits for its request (queueing included)
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "90"))
+
+# Lower runs first
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+PRIORITY_NAMES = {INTERACTIVE: "interactive", NORMAL: "normal", BACKGROUND: "background"}
+
+_gateway = None
+_gateway_lock = threading.Lock()
+_STREAM_END = object()
+
+
+class LLMGateway:
+    """
+    Process-wide access to the local Ollama server.
+
+    One `ollama.Client` (one pooled HTTP connection pool) is shared by every
+    caller. Requests go through a priority queue served by `concurrency`
+    worker threads, so interactive comparisons overtake queued background
+    summaries and a burst of users never runs more than `concurrency`
+    generations at once. Callers give up after `timeout` seconds; a request
+    still queued by then is dropped without reaching Ollama.
+    """
+
+    def __init__(self, host=OLLAMA_HOST, concurrency=LLM_CONCURRENCY, request_timeout=LLM_REQUEST_TIMEOUT):
+        self.client = Client(host=host, timeout=request_timeout)
+        self.concurrency = concurrency
+        self.request_timeout = request_timeout
+
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._queued = dict.fromkeys(PRIORITY_NAMES, 0)
+        self._stats = {"running": 0, "completed": 0, "errors": 0, "timed_out": 0, "dropped": 0}
+        self._first_token = deque(maxlen=100)
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"llm-gateway-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    # ─────────────────────────────────────────────
+    # PUBLIC API
+    # ─────────────────────────────────────────────
+    def submit(self, method, priority=NORMAL, **kwargs):
+        """Queue `client.<method>(**kwargs)` and return its Future."""
+        return self._enqueue(method, lambda: getattr(self.client, method)(**kwargs), priority)
+
+    def call(self, method, priority=NORMAL, timeout=None, **kwargs):
+        timeout = self.request_timeout if timeout is None else timeout
+        future = self.submit(method, priority, **kwargs)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            # Still queued -> never sent; already running -> bounded by the HTTP timeout
+            future.cancel()
+            with self._lock:
+                self._stats["timed_out"] += 1
+            raise TimeoutError(f"LLM {method} timed out after {timeout}s") from None
+
+    def chat(self, priority=NORMAL, timeout=None, **kwargs):
+        return self.call("chat", priority, timeout, **kwargs)
+
+    def generate(self, priority=NORMAL, timeout=None, **kwargs):
+        return self.call("generate", priority, timeout, **kwargs)
+
+    def embed(self, priority=NORMAL, timeout=None, **kwargs):
+        return self.call("embed", priority, timeout, **kwargs)
+
+    def stream(self, method, priority=NORMAL, timeout=None, **kwargs):
+        """
+        Yield the chunks of `client.<method>(stream=True, **kwargs)` as Ollama
+        produces them. The generation holds one concurrency slot until it
+        finishes or the consumer stops iterating. `timeout` bounds the wait
+        for the first chunk (queueing included) and for each chunk after it.
+        """
+        timeout = self.request_timeout if timeout is None else timeout
+        chunks = queue.Queue()
+        closed = threading.Event()
+
+        def pump():
+            for chunk in getattr(self.client, method)(stream=True, **kwargs):
+                if closed.is_set():
+                    break
+                chunks.put(chunk)
+
+        started = time.perf_counter()
+        future = self._enqueue(method, pump, priority)
+        future.add_done_callback(lambda _: chunks.put(_STREAM_END))
+        first = True
+
+        try:
+            while True:
+                try:
+                    chunk = chunks.get(timeout=timeout)
+                except queue.Empty:
+                    future.cancel()
+                    with self._lock:
+                        self._stats["timed_out"] += 1
+                    raise TimeoutError(f"LLM {method} stream stalled for {timeout}s") from None
+
+                if chunk is _STREAM_END:
+                    if not future.cancelled() and future.exception() is not None:
+                        raise future.exception()
+                    return
+
+                if first:
+                    first = False
+                    with self._lock:
+                        self._first_token.append(time.perf_counter() - started)
+                yield chunk
+        finally:
+            closed.set()
+
+    def stats(self):
+        with self._lock:
+            queued = {PRIORITY_NAMES[p]: n for p, n in self._queued.items()}
+            first_token = sorted(self._first_token)
+            return {
+                "concurrency": self.concurrency,
+                "queue_depth": sum(queued.values()),
+                "queued": queued,
+                **self._stats,
+                "first_token_ms_p50": round(first_token[len(first_token) // 2] * 1000, 1) if first_token else None,
+                "first_token_ms_last": round(self._first_token[-1] * 1000, 1) if first_token else None,
+            }
+
+    # ─────────────────────────────────────────────
+    # WORKERS
+    # ─────────────────────────────────────────────
+    def _enqueue(self, method, fn, priority):
+        future = concurrent.futures.Future()
+        with self._lock:
+            self._queued[priority] += 1
+        self._queue.put((priority, next(self._sequence), future, method, fn))
+        return future
+
+    def _work(self):
+        while True:
+            priority, _, future, method, fn = self._queue.get()
+            with self._lock:
+                self._queued[priority] -= 1
+
+            if not future.set_running_or_notify_cancel():
+                with self._lock:
+                    self._stats["dropped"] += 1
+                continue
+
+            with self._lock:
+                self._stats["running"] += 1
+            try:
+                future.set_result(fn())
+                outcome = "completed"
+            except Exception as e:
+                logger.warning(f"[LLM] {method} failed: {e}")
+                future.set_exception(e)
+                outcome = "errors"
+
+            with self._lock:
+                self._stats["running"] -= 1
+                self._stats[outcome] += 1
+
+
+def get_llm_gateway():
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+    return _gateway
@@ -0,0 +1,335 @@
+import unicodedata
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+try:
+    from rapidfuzz.distance import Indel
+except ImportError:  # optional — falls back to difflib's own upper bounds
+    Indel = None
+
+BLACKLIST = {
+    "black", "white", "red", "blue", "green", "pink", "purple", "orange", "yellow",
+    "xl", "l", "s", "m", "xxl", "hydrating", "refreshing", "glow", "classic",
+    "combo", "pack", "kit", "style", "for", "with", "set", "edition", "cream", "gel"
+}
+
+MATCH_THRESHOLD = 0.7
+SITE_ORDER = ("myntra", "flipkart", "nykaa", "amazon")
+EMPTY_KEY = "<empty>"
+SHORT_KEY = "<short>"
+# A pair with ratio > 0.7 and at most 17 chars between them has both names
+# <= 11 chars, so the "<short>" bucket compares every such pair
+SHORT_NAME = 11
+VOWELS = set("aeiouy")
+
+
+def normalize_name(name: str) -> str:
+    if not name:
+        return ""
+    words = name.lower().split()
+    return " ".join([w for w in words if w not in BLACKLIST])
+
+
+# ─────────────────────────────────────────────
+# BLOCKING
+# ─────────────────────────────────────────────
+def consonant_skeleton(token: str) -> str:
+    """"Lakmé" / "lakme" -> "lkm", "wterproof" / "waterproof" -> "wtrprf"."""
+    plain = unicodedata.normalize("NFKD", token).encode("ascii", "ignore").decode()
+    return "".join(c for c in plain if c not in VOWELS)
+
+
+def blocking_keys(normalized: str, brand: str = "") -> set:
+    """
+    Keys a product is indexed under: its normalized tokens, a 4-char prefix and
+    a consonant skeleton of longer tokens (so plurals, accents and dropped
+    vowels still meet) and its brand. Only products sharing at least one key
+    are ever scored against each other.
+
+    Complete for short pairs (see SHORT_NAME) but not in general: two longer
+    names can clear 0.7 while sharing no token, prefix or skeleton, e.g. when
+    words are split or merged differently ("fgjh fgacfg" / "fjagjh f gagg").
+    Such pairs are missed, so grouping can differ from `match_exhaustive`.
+    """
+    keys = set()
+    for token in normalized.split():
+        if len(token) == 2:
+            keys.add(token)
+        if len(token) >= 3:
+            keys.add(token)
+            keys.add("~" + consonant_skeleton(token))
+        if len(token) > 4:
+            keys.add(token[:4] + "*")
+
+    brand_tokens = normalize_name(brand).split() if brand and brand != "-" else []
+    if brand_tokens:
+        keys.add(brand_tokens[0])
+
+    # Names that normalize to nothing still match each other, as they always did
+    if not normalized:
+        keys.add(EMPTY_KEY)
+    # Short names ("4g", "spf 50", "cafgf bj") can clear the threshold on a
+    # few scattered characters, which no token key catches — compare them all
+    elif len(normalized) <= SHORT_NAME:
+        keys.add(SHORT_KEY)
+    return keys
+
+
+# ─────────────────────────────────────────────
+# SIMILARITY KERNEL
+# ─────────────────────────────────────────────
+def is_similar(a: str, b: str, threshold: float = MATCH_THRESHOLD) -> bool:
+    """
+    Exactly `SequenceMatcher(None, a, b).ratio() > threshold`, but rejects most
+    pairs with cheap upper bounds first: the length bound, then the LCS-based
+    Indel similarity from rapidfuzz (or difflib's quick_ratio without it).
+    """
+    total = len(a) + len(b)
+    if not total:
+        return 1.0 > threshold
+    if 2.0 * min(len(a), len(b)) / total <= threshold:
+        return False
+    if Indel is not None and Indel.normalized_similarity(a, b) <= threshold:
+        return False
+
+    matcher = SequenceMatcher(None, a, b)
+    if Indel is None and matcher.quick_ratio() <= threshold:
+        return False
+    return matcher.ratio() > threshold
+
+
+# ─────────────────────────────────────────────
+# GROUPING
+# ─────────────────────────────────────────────
+def prepare_products(sites):
+    """
+    Flatten [(site, products)] into one list of Products. Scraped Products
+    already carry `source` and `normalized`; plain dicts are converted.
+    """
+    from utils.product import Product  # utils.product imports normalize_name from here
+
+    all_products = []
+    for site, products in sites:
+        for p in products:
+            if not p.get("name"):
+                continue
+            if not isinstance(p, Product) or p.source != site:
+                p = Product.from_dict(p, site)
+            all_products.append(p)
+    return all_products
+
+
+def has_two_sites(group) -> bool:
+    return sum(1 for v in group.values() if v) >= 2
+
+
+def greedy_groups(all_products, neighbours):
+    """
+    Greedy grouping from precomputed {i: [(j, score), ...]} neighbour lists
+    (j > i): each unclaimed product seeds a group and claims its unclaimed
+    neighbours, keeping the best-scoring product per site.
+    """
+    matched = []
+    seen = set()
+
+    for i, p1 in enumerate(all_products):
+        if i in seen:
+            continue
+
+        group = dict.fromkeys(SITE_ORDER)
+        group[p1.source] = p1
+        seen.add(i)
+
+        # Ascending score, so the best candidate per site is written last
+        for j, _ in sorted(neighbours.get(i, []), key=lambda pair: pair[1]):
+            if j in seen:
+                continue
+            group[all_products[j].source] = all_products[j]
+            seen.add(j)
+
+        if has_two_sites(group):
+            matched.append(group)
+
+    return matched
+
+
+# ─────────────────────────────────────────────
+# BACKENDS
+# ─────────────────────────────────────────────
+def match_exhaustive(sites, threshold: float = MATCH_THRESHOLD):
+    """Reference all-pairs SequenceMatcher grouping — O(n²), kept for benchmarks."""
+    all_products = prepare_products(sites)
+    matched = []
+    seen = set()
+
+    for i, p1 in enumerate(all_products):
+        if i in seen:
+            continue
+
+        group = dict.fromkeys(SITE_ORDER)
+        group[p1.source] = p1
+        seen.add(i)
+
+        for j in range(i + 1, len(all_products)):
+            if j in seen:
+                continue
+
+            p2 = all_products[j]
+            if SequenceMatcher(None, p1.normalized, p2.normalized).ratio() > threshold:
+                group[p2.source] = p2
+                seen.add(j)
+
+        if has_two_sites(group):
+            matched.append(group)
+
+    return matched
+
+
+class IncrementalMatcher:
+    """
+    The greedy all-pairs grouping, fed one site's batch at a time.
+
+    In the all-pairs loop a product is claimed by the earliest seed it is
+    similar to, and becomes a seed itself only if there is none — so each
+    arriving product needs comparing against existing seeds only. Seeds are
+    kept in an inverted index over blocking keys, making `add` cost
+    O(batch × candidates). Fed in the same order, the groups match the
+    all-pairs result except where blocking misses a similar pair (see
+    `blocking_keys`).
+    """
+
+    def __init__(self, threshold: float = MATCH_THRESHOLD):
+        self.threshold = threshold
+        self.seeds = []
+        self.groups_by_seed = []
+        self.index = defaultdict(list)
+        # Catalog groups: canonical id -> seed, and the (seed, site) slots confirmed members hold
+        self.seed_by_canonical = {}
+        self.confirmed = set()
+
+    def add(self, site, products, canonical=None):
+        """
+        Match one site's batch into the existing groups and return `groups()`.
+        Products listed in `canonical` ({product id: canonical id}) join their
+        catalog group by lookup once it is present, unless another product
+        already holds that group's slot for their site.
+        """
+        canonical = canonical or {}
+        for p in prepare_products([(site, products)]):
+            keys = blocking_keys(p.normalized, p.brand)
+            cid = canonical.get(p.id)
+            seed = self.seed_by_canonical.get(cid) if cid is not None else None
+            if seed is not None and (seed, p.source) not in self.confirmed:
+                self._claim(seed, p, cid)
+                continue
+
+            # Seed ids grow monotonically, so the smallest similar one is the earliest
+            candidates = sorted({s for key in keys for s in self.index[key]})
+            owner = next(
+                (s for s in candidates if is_similar(self.seeds[s].normalized, p.normalized, self.threshold)),
+                None,
+            )
+
+            if owner is None:
+                owner = self._add_seed(p, dict.fromkeys(SITE_ORDER), keys)
+            elif (owner, p.source) in self.confirmed:
+                # A confirmed member keeps its slot; the product is claimed but
+                # left out, as it is when a later product overwrites it
+                continue
+            # Only the first member of a canonical group binds it to a seed
+            self._claim(owner, p, cid if seed is None else None)
+
+        return self.groups()
+
+    def _claim(self, seed, product, cid=None):
+        """Put `product` in the seed's group; a catalog-known product pins its slot."""
+        self.groups_by_seed[seed][product.source] = product
+        if cid is None or self.seed_by_canonical.setdefault(cid, seed) != seed:
+            return
+        self.confirmed.add((seed, product.source))
+
+    def _add_seed(self, product, group, keys):
+        seed = len(self.seeds)
+        self.seeds.append(product)
+        self.groups_by_seed.append(group)
+        for key in keys:
+            self.index[key].append(seed)
+        return seed
+
+    def groups(self):
+        """Groups spanning at least two sites so far, in seed order."""
+        return [dict(group) for group in self.groups_by_seed if has_two_sites(group)]
+
+
+def match_blocked(sites, threshold: float = MATCH_THRESHOLD):
+    """
+    Greedy in input order, like the all-pairs loop, with candidates drawn from
+    a blocking-key index of seeds instead of every later product.
+    """
+    matcher = IncrementalMatcher(threshold)
+    for site, products in sites:
+        matcher.add(site, products)
+    return matcher.groups()
+
+
+def match_tfidf(sites, threshold=None):
+    """Character n-gram TF-IDF cosine similarity, one sparse product for all pairs."""
+    from utils.tfidf_matcher import DEFAULT_THRESHOLD, match_tfidf as tfidf_neighbours
+
+    all_products = prepare_products(sites)
+    neighbours = tfidf_neighbours(all_products, DEFAULT_THRESHOLD if threshold is None else threshold)
+    return greedy_groups(all_products, neighbours)
+
+
+def match_with_catalog(sites, catalog, threshold: float = MATCH_THRESHOLD):
+    """
+    Blocked matching that resolves products the catalog already knows by id
+    lookup: once a canonical group is present, its other known members join
+    it without scoring. Everything else — unknown products, the first member
+    of each canonical group and known products whose slot is taken — goes
+    through the usual greedy matching, with confirmed members never
+    displaced. New cross-site groups are recorded back into the catalog, so
+    repeating a search reproduces its groups.
+    """
+    canonical = catalog.resolve_many(prepare_products(sites))
+
+    matcher = IncrementalMatcher(threshold)
+    for site, products in sites:
+        matcher.add(site, products, canonical)
+
+    groups = matcher.groups()
+    catalog.record_groups(groups)
+    return groups
+
+
+def match_embedding(sites, threshold=None):
+    """Cosine similarity of local Ollama name embeddings, cached on disk by name hash."""
+    from utils.embedding_matcher import DEFAULT_THRESHOLD, match_embedding as embedding_neighbours
+
+    all_products = prepare_products(sites)
+    neighbours = embedding_neighbours(all_products, DEFAULT_THRESHOLD if threshold is None else threshold)
+    return greedy_groups(all_products, neighbours)
+
+
+MATCH_BACKENDS = {
+    "blocked": match_blocked,
+    "exhaustive": match_exhaustive,
+    "tfidf": match_tfidf,
+    "embedding": match_embedding,
+}
+DEFAULT_BACKEND = "blocked"
+
+
+def match_products(sites, threshold=None, backend=DEFAULT_BACKEND):
+    """
+    Group the same product across `sites` ([(site, products)]) with the chosen
+    backend. `threshold` defaults to each backend's own cut-off.
+    """
+    try:
+        match = MATCH_BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown matching backend '{backend}', expected one of {sorted(MATCH_BACKENDS)}")
+
+    if threshold is None:
+        return match(sites)
+    return match(sites, threshold)
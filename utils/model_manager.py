@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+from collections import deque
+
+from utils.llm_gateway import BACKGROUND, NORMAL, get_llm_gateway
+from utils.logger import logger
+
+# Small model for cheap tasks, larger one where answer quality matters
+FAST_MODEL = os.getenv("LLM_FAST_MODEL", "tinyllama")
+QUALITY_MODEL = os.getenv("LLM_QUALITY_MODEL", "mistral")
+
+TASK_MODELS = {
+    "suggestions": FAST_MODEL,
+    "summary": QUALITY_MODEL,
+    "insights": QUALITY_MODEL,
+    "comparison_summary": QUALITY_MODEL,
+    "compare_products": QUALITY_MODEL,
+}
+
+# Per-task overrides, e.g. LLM_TASK_MODELS="suggestions=phi3,summary=llama3"
+for _entry in filter(None, os.getenv("LLM_TASK_MODELS", "").split(",")):
+    _task, _, _model = _entry.partition("=")
+    if _model.strip():
+        TASK_MODELS[_task.strip()] = _model.strip()
+
+# How long Ollama keeps a model in memory after its last request
+LLM_KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "30m")
+
+# A request whose model load took longer than this counts as a cold load
+COLD_LOAD_MS = float(os.getenv("LLM_COLD_LOAD_MS", "1000"))
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def ns_to_ms(value):
+    return round((value or 0) / 1e6, 1)
+
+
+class ModelManager:
+    """
+    Chooses the model for each LLM task, keeps the configured models resident
+    in Ollama (preload at startup + `keep_alive` on every request) and tracks
+    per-model latency and load time. Requests go through the LLM gateway.
+    """
+
+    def __init__(self, gateway=None, task_models=None, keep_alive=LLM_KEEP_ALIVE):
+        self.gateway = gateway or get_llm_gateway()
+        self.task_models = dict(task_models or TASK_MODELS)
+        self.keep_alive = keep_alive
+
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._preload_started = False
+        self._preloaded = {}
+
+    def model_for(self, task):
+        return self.task_models.get(task, QUALITY_MODEL)
+
+    def models(self):
+        return sorted(set(self.task_models.values()))
+
+    # ─────────────────────────────────────────────
+    # REQUESTS
+    # ─────────────────────────────────────────────
+    def chat(self, task, priority=NORMAL, timeout=None, **kwargs):
+        return self._call("chat", task, priority, timeout, **kwargs)
+
+    def generate(self, task, priority=NORMAL, timeout=None, **kwargs):
+        return self._call("generate", task, priority, timeout, **kwargs)
+
+    def stream(self, method, task, priority=NORMAL, timeout=None, **kwargs):
+        """Like `LLMGateway.stream`, with the task's model; stats come from the final chunk."""
+        model = self.model_for(task)
+        started = time.perf_counter()
+        try:
+            for chunk in self.gateway.stream(method, priority, timeout, model=model,
+                                             keep_alive=self.keep_alive, **kwargs):
+                if chunk.get("done"):
+                    self._record(model, time.perf_counter() - started, chunk)
+                yield chunk
+        except Exception:
+            self._record(model, time.perf_counter() - started, None)
+            raise
+
+    def _call(self, method, task, priority, timeout, **kwargs):
+        model = self.model_for(task)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.gateway.call(method, priority, timeout, model=model,
+                                         keep_alive=self.keep_alive, **kwargs)
+            return response
+        finally:
+            self._record(model, time.perf_counter() - started, response)
+
+    # ─────────────────────────────────────────────
+    # PRELOAD
+    # ─────────────────────────────────────────────
+    def preload(self, models=None):
+        """
+        Load `models` (default: every configured one) into Ollama so the first
+        user request does not pay for it. An empty prompt loads without
+        generating. Returns {model: load_ms or None if it failed}.
+        """
+        loaded = {}
+        for model in models or self.models():
+            started = time.perf_counter()
+            try:
+                response = self.gateway.generate(model=model, prompt="", keep_alive=self.keep_alive,
+                                                 priority=BACKGROUND)
+                loaded[model] = ns_to_ms(response.get("load_duration"))
+                logger.info(f"[MODELS] {model} resident ({loaded[model]} ms load, "
+                            f"{(time.perf_counter() - started) * 1000:.0f} ms total)")
+            except Exception as e:
+                loaded[model] = None
+                logger.warning(f"[MODELS] preload of {model} failed: {e}")
+        with self._lock:
+            self._preloaded.update(loaded)
+        return loaded
+
+    def start_preload(self):
+        """Run `preload` once per process in a background thread; later calls are no-ops."""
+        with self._lock:
+            if self._preload_started:
+                return
+            self._preload_started = True
+        logger.info(f"[MODELS] preloading {', '.join(self.models())}")
+        threading.Thread(target=self.preload, name="model-preload", daemon=True).start()
+
+    # ─────────────────────────────────────────────
+    # STATS
+    # ─────────────────────────────────────────────
+    def _record(self, model, elapsed, response):
+        load_ms = ns_to_ms(response.get("load_duration")) if response is not None else 0
+        with self._lock:
+            stats = self._stats.setdefault(model, {
+                "requests": 0, "errors": 0, "cold_loads": 0,
+                "latency": deque(maxlen=100), "load_ms_last": None,
+            })
+            stats["requests"] += 1
+            if response is None:
+                stats["errors"] += 1
+                return
+            stats["latency"].append(elapsed)
+            stats["load_ms_last"] = load_ms
+            if load_ms > COLD_LOAD_MS:
+                stats["cold_loads"] += 1
+
+    def stats(self):
+        with self._lock:
+            per_model = {}
+            for model, stats in self._stats.items():
+                latency = sorted(stats["latency"])
+                per_model[model] = {
+                    "requests": stats["requests"],
+                    "errors": stats["errors"],
+                    "cold_loads": stats["cold_loads"],
+                    "load_ms_last": stats["load_ms_last"],
+                    "latency_ms_p50": round(latency[len(latency) // 2] * 1000, 1) if latency else None,
+                    "latency_ms_p95": round(latency[int(len(latency) * 0.95)] * 1000, 1) if latency else None,
+                }
+            return {
+                "tasks": dict(self.task_models),
+                "keep_alive": self.keep_alive,
+                "preloaded": dict(self._preloaded),
+                "models": per_model,
+            }
+
+
+def get_model_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ModelManager()
+    return _manager
@@ -0,0 +1,156 @@
+import re
+import hashlib
+from dataclasses import dataclass
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from utils.matcher import normalize_name
+
+PRICE_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def parse_price_paise(price) -> int:
+    """"₹1,299" / "Rs. 499" / "499.50" -> integer paise; 0 when there is no number."""
+    match = PRICE_RE.search(str(price or ""))
+    if not match:
+        return 0
+    return round(float(match.group(0).replace(",", "")) * 100)
+
+
+ASIN_RE = re.compile(r"/(?:dp|gp/product|gp/aw/d)/([A-Z0-9]{10})(?:[/?]|$)")
+NYKAA_ID_RE = re.compile(r"/p/(\d+)")
+MYNTRA_ID_RE = re.compile(r"/(\d+)/buy")
+
+
+def amazon_asin(parts):
+    match = ASIN_RE.search(parts.path)
+    if match:
+        return match.group(1)
+    # Sponsored results all go through /sspa/click; the listing is in `url=`
+    target = parse_qs(parts.query).get("url", [""])[0]
+    match = ASIN_RE.search(urlsplit(unquote(target)).path) if target else None
+    return match.group(1) if match else ""
+
+
+def site_listing_id(source: str, link: str) -> str:
+    """
+    The site's own id for a listing: Amazon ASIN, Flipkart `pid`, Nykaa and
+    Myntra product number. Paths and tracking params change with search rank
+    and ad placement, so the raw URL is not used. "" when there is none.
+    """
+    if not link:
+        return ""
+    parts = urlsplit(link)
+    query = parse_qs(parts.query)
+
+    if source == "amazon":
+        return amazon_asin(parts)
+    if source == "flipkart":
+        return query.get("pid", [""])[0]
+    if source == "nykaa":
+        match = NYKAA_ID_RE.search(parts.path)
+        return match.group(1) if match else query.get("productId", [""])[0]
+    if source == "myntra":
+        match = MYNTRA_ID_RE.search(parts.path)
+        return match.group(1) if match else ""
+    return ""
+
+
+def product_id(source: str, link: str, normalized: str = "") -> str:
+    """Stable across searches: the site's listing id, falling back to the normalized name."""
+    listing = site_listing_id(source, link)
+    base = f"id:{listing}" if listing else f"name:{normalized}"
+    return hashlib.blake2b(f"{source}:{base}".encode(), digest_size=8).hexdigest()
+
+
+@dataclass(slots=True)
+class Product:
+    """
+    One scraped listing. Built once at scrape time with its normalized name,
+    tokens and integer price already computed, so matching, filtering and
+    rendering never re-parse it. Supports `p["name"]` / `p.get("name")` for
+    code written against the old product dicts.
+    """
+    brand: str
+    name: str
+    price: str
+    image: str
+    link: str
+    source: str
+    normalized: str
+    tokens: tuple
+    price_paise: int
+    id: str
+
+    @classmethod
+    def create(cls, source, name, price, image="", link="", brand="-"):
+        normalized = normalize_name(name)
+        return cls(
+            brand=brand,
+            name=name,
+            price=price,
+            image=image,
+            link=link,
+            source=source,
+            normalized=normalized,
+            tokens=tuple(normalized.split()),
+            price_paise=parse_price_paise(price),
+            id=product_id(source, link, normalized),
+        )
+
+    @classmethod
+    def from_dict(cls, data, source=None):
+        """Rebuild from `to_dict()` output, or derive the fields from a plain product dict."""
+        source = source or data.get("source", "")
+        if "normalized" in data and data.get("source") == source:
+            return cls(
+                brand=data["brand"],
+                name=data["name"],
+                price=data["price"],
+                image=data["image"],
+                link=data["link"],
+                source=source,
+                normalized=data["normalized"],
+                tokens=tuple(data["tokens"]),
+                price_paise=data["price_paise"],
+                # Recomputed, so entries cached before an id scheme change still line up
+                id=product_id(source, data["link"], data["normalized"]),
+            )
+        return cls.create(
+            source,
+            data.get("name") or "",
+            data.get("price", "-"),
+            data.get("image", ""),
+            data.get("link", ""),
+            data.get("brand", "-"),
+        )
+
+    def to_dict(self):
+        return {
+            "brand": self.brand,
+            "name": self.name,
+            "price": self.price,
+            "image": self.image,
+            "link": self.link,
+            "source": self.source,
+            "normalized": self.normalized,
+            "tokens": list(self.tokens),
+            "price_paise": self.price_paise,
+            "id": self.id,
+        }
+
+    # Dict-style access for templates and callers that predate Product
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key):
+        return key in self.__dataclass_fields__
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+
+def to_dicts(products):
+    return [p.to_dict() if isinstance(p, Product) else p for p in products]
@@ -0,0 +1,140 @@
+import os
+import math
+import threading
+
+from utils.matcher import SITE_ORDER, normalize_name
+
+# Upper bound on the prompt size sent to the model, in estimated tokens
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "600"))
+CHARS_PER_TOKEN = 4
+
+# Listing titles are padded with shade lists, pack sizes and SEO words
+NAME_MAX_CHARS = int(os.getenv("PROMPT_NAME_MAX_CHARS", "70"))
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def short_name(name: str, max_chars: int = NAME_MAX_CHARS) -> str:
+    """Collapse whitespace and cut at a word boundary to at most `max_chars`."""
+    name = " ".join(str(name or "").split())
+    if len(name) <= max_chars:
+        return name
+    cut = name[:max_chars - 1].rsplit(" ", 1)[0]
+    return cut.rstrip(" ,-|(") + "…"
+
+
+def unique_names(products, max_chars: int = NAME_MAX_CHARS) -> list:
+    """Shortened product names, dropping ones that normalise to a name already listed."""
+    names = {}
+    for p in products:
+        name = short_name(p["name"], max_chars)
+        key = normalize_name(name) or name.lower()
+        if name and key not in names:
+            names[key] = name
+    return list(names.values())
+
+
+def site_sections(sites: dict) -> dict:
+    """{"Myntra": [names...], ...} — only names go into search prompts."""
+    return {site.capitalize(): unique_names(products) for site, products in sites.items()}
+
+
+def matched_set_lines(matched_products: list) -> list:
+    """
+    One line per cross-site group: "name (Myntra, Nykaa); other name (Amazon)".
+    Prices, links, images and derived fields are left out.
+    """
+    lines = []
+    for group in matched_products:
+        by_name = {}
+        for site in SITE_ORDER:
+            p = group.get(site)
+            if p is None:
+                continue
+            name = short_name(p["name"])
+            by_name.setdefault(normalize_name(name) or name.lower(), [name, []])[1].append(site.capitalize())
+        if by_name:
+            lines.append("; ".join(f"{name} ({', '.join(sources)})" for name, sources in by_name.values()))
+    return lines
+
+
+def render_sections(sections: dict, sep: str = "; ") -> str:
+    """"Label: a; b" per section; a multi-line `sep` starts the items on their own lines."""
+    lead = sep if "\n" in sep else " "
+    return "\n".join(f"{label}:{lead}{sep.join(items)}" if items else f"{label}: -" for label, items in sections.items())
+
+
+def fit_sections(sections: dict, budget_tokens: int, sep: str = "; ") -> tuple:
+    """
+    Drop items from the end of the longest section until the rendered text
+    fits `budget_tokens`; every section keeps at least one item. Returns
+    (text, number of items dropped); the text is hard-cut if still too long.
+    """
+    sections = {label: list(items) for label, items in sections.items()}
+    budget_chars = max(budget_tokens, 0) * CHARS_PER_TOKEN
+    dropped = 0
+    text = render_sections(sections, sep)
+
+    while len(text) > budget_chars:
+        longest = max(sections, key=lambda label: len(sections[label]), default=None)
+        if longest is None or len(sections[longest]) <= 1:
+            break
+        sections[longest].pop()
+        dropped += 1
+        text = render_sections(sections, sep)
+
+    if len(text) > budget_chars:
+        text = text[:max(budget_chars - 1, 0)] + "…"
+    return text, dropped
+
+
+def build_prompt(task: str, render, sections: dict, budget: int = PROMPT_TOKEN_BUDGET, sep: str = "; ") -> str:
+    """
+    `render(body)` wraps the task's instructions around the data block; the
+    data is trimmed so the whole prompt stays within `budget` tokens.
+    """
+    overhead = estimate_tokens(render(""))
+    body, dropped = fit_sections(sections, budget - overhead, sep)
+    prompt = render(body)
+    record(task, prompt, dropped)
+    return prompt
+
+
+# ─────────────────────────────────────────────
+# METRICS
+# ─────────────────────────────────────────────
+def record(task: str, prompt: str, dropped: int = 0):
+    tokens = estimate_tokens(prompt)
+    with _stats_lock:
+        stats = _stats.setdefault(task, {"prompts": 0, "tokens_total": 0, "tokens_max": 0,
+                                         "tokens_last": 0, "trimmed": 0, "items_dropped": 0})
+        stats["prompts"] += 1
+        stats["tokens_total"] += tokens
+        stats["tokens_max"] = max(stats["tokens_max"], tokens)
+        stats["tokens_last"] = tokens
+        stats["trimmed"] += bool(dropped)
+        stats["items_dropped"] += dropped
+
+
+def prompt_stats() -> dict:
+    """Estimated prompt tokens per task (avg / max / last) and how often the budget trimmed data."""
+    with _stats_lock:
+        return {
+            "budget": PROMPT_TOKEN_BUDGET,
+            "tasks": {
+                task: {
+                    "prompts": s["prompts"],
+                    "tokens_avg": round(s["tokens_total"] / s["prompts"], 1),
+                    "tokens_max": s["tokens_max"],
+                    "tokens_last": s["tokens_last"],
+                    "trimmed": s["trimmed"],
+                    "items_dropped": s["items_dropped"],
+                }
+                for task, s in _stats.items()
+            },
+        }
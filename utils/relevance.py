@@ -0,0 +1,91 @@
+import math
+from collections import Counter
+
+from utils.matcher import normalize_name
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Normalized score at or above which a product counts towards the match %
+RELEVANCE_THRESHOLD = 0.5
+
+
+def stem(token: str) -> str:
+    """Crude plural folding so "lipsticks" still scores against "lipstick"."""
+    if len(token) > 4 and token.endswith("es") and token[-3] in "sxz":
+        return token[:-2]
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+class RelevanceIndex:
+    """
+    BM25 over one site's results. Built once per result list; `score` then
+    costs one pass over the query terms' postings instead of a string
+    comparison per product.
+    """
+
+    def __init__(self, products, k1=BM25_K1, b=BM25_B):
+        self.products = products
+        self.k1 = k1
+        self.b = b
+
+        self.term_freqs = [Counter(stem(t) for t in p.tokens) for p in products]
+        self.lengths = [sum(tf.values()) for tf in self.term_freqs]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if products else 0.0
+
+        self.postings = {}
+        for i, tf in enumerate(self.term_freqs):
+            for term in tf:
+                self.postings.setdefault(term, []).append(i)
+
+    def idf(self, term):
+        n = len(self.products)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, keyword):
+        """
+        Scores in [0, 1] per product, normalized by what a product holding
+        every query term once at average length would get — so a product
+        missing a rare query term scores low even if it repeats the others.
+        """
+        terms = [stem(t) for t in normalize_name(keyword).split()]
+        scores = [0.0] * len(self.products)
+        if not terms or not self.products:
+            return scores
+
+        best = 0.0
+        for term in terms:
+            idf = self.idf(term)
+            best += idf
+            for i in self.postings.get(term, ()):
+                tf = self.term_freqs[i][term]
+                norm = 1 - self.b + self.b * self.lengths[i] / (self.avg_length or 1)
+                scores[i] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+
+        return [min(s / best, 1.0) for s in scores] if best else scores
+
+
+def rank_by_relevance(products, keyword, threshold=RELEVANCE_THRESHOLD):
+    """
+    (match %, products ordered most relevant first). A product counts as a
+    match when the normalized keyword appears in its name or its BM25 score
+    reaches `threshold`. Products without a name are left out of the %
+    but kept at the end of the ranking.
+    """
+    named = [p for p in products if p.name]
+    if not named:
+        return 0.0, list(products)
+
+    phrase = normalize_name(keyword)
+    scores = RelevanceIndex(named).score(keyword)
+    for i, p in enumerate(named):
+        if phrase in p.normalized:
+            scores[i] = max(scores[i], 1.0)
+
+    matches = sum(1 for s in scores if s >= threshold)
+    order = sorted(range(len(named)), key=lambda i: -scores[i])
+    ranked = [named[i] for i in order] + [p for p in products if not p.name]
+    return round((matches / len(named)) * 100, 2), ranked
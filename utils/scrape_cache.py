@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+
+from utils.cache import TieredCache
+from utils.logger import logger
+from utils.product import Product, to_dicts
+
+SCRAPE_CACHE_DB = os.getenv("SCRAPE_CACHE_DB", "scrape_cache.db")
+DEFAULT_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "1800"))
+
+# Per-site freshness in seconds
+SITE_TTLS = {
+    "myntra": int(os.getenv("SCRAPE_CACHE_TTL_MYNTRA", DEFAULT_TTL)),
+    "flipkart": int(os.getenv("SCRAPE_CACHE_TTL_FLIPKART", DEFAULT_TTL)),
+    "nykaa": int(os.getenv("SCRAPE_CACHE_TTL_NYKAA", DEFAULT_TTL)),
+    "amazon": int(os.getenv("SCRAPE_CACHE_TTL_AMAZON", DEFAULT_TTL)),
+}
+
+# How long past its TTL an entry may still be served while it is refreshed
+STALE_WHILE_REVALIDATE = int(os.getenv("SCRAPE_CACHE_STALE", "21600"))
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_keyword(keyword: str) -> str:
+    return " ".join((keyword or "").lower().split())
+
+
+class ScrapeCache:
+    """
+    Per-site scrape results keyed by (normalized keyword, site).
+
+    Fresh entries are served directly. Entries past their TTL but inside the
+    stale-while-revalidate window are served too, and refreshed in the
+    background — at most one refresh per key at a time.
+    """
+
+    def __init__(self, store=None, ttls=None, stale_for=STALE_WHILE_REVALIDATE):
+        self.store = store or TieredCache(SCRAPE_CACHE_DB, "scrape_results", max_memory=512, max_disk=5000)
+        self.ttls = {**SITE_TTLS, **(ttls or {})}
+        self.stale_for = stale_for
+
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(keyword, site):
+        return f"{site}:{normalize_keyword(keyword)}"
+
+    def lookup(self, keyword, sites):
+        """Split cached `sites` into ({site: fresh products}, {site: stale products})."""
+        fresh, stale = {}, {}
+        now = time.time()
+
+        for site in sites:
+            entry = self.store.get(self.key(keyword, site))
+            if entry is None:
+                continue
+
+            products, stored_at = entry
+            age = now - stored_at
+            ttl = self.ttls.get(site, DEFAULT_TTL)
+            if age <= ttl:
+                fresh[site] = [Product.from_dict(p, site) for p in products]
+            elif age <= ttl + self.stale_for:
+                stale[site] = [Product.from_dict(p, site) for p in products]
+
+        return fresh, stale
+
+    def save(self, keyword, results):
+        # Empty lists are usually a blocked or failed scrape — never pin those
+        for site, products in results.items():
+            if products:
+                self.store.set(self.key(keyword, site), to_dicts(products))
+
+    def revalidate(self, keyword, sites, submit):
+        """
+        Refresh stale `sites` in the background. `submit(keyword, sites)` must
+        return a Future resolving to {site: products}.
+        """
+        with self._lock:
+            sites = [s for s in sites if self.key(keyword, s) not in self._refreshing]
+            self._refreshing.update(self.key(keyword, s) for s in sites)
+        if not sites:
+            return
+
+        def finish(future):
+            try:
+                self.save(keyword, future.result())
+            except Exception as e:
+                logger.warning(f"[CACHE] background refresh failed for '{keyword}': {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(self.key(keyword, s) for s in sites)
+
+        try:
+            submit(keyword, sites).add_done_callback(finish)
+        except Exception as e:
+            logger.warning(f"[CACHE] could not schedule refresh for '{keyword}': {e}")
+            with self._lock:
+                self._refreshing.difference_update(self.key(keyword, s) for s in sites)
+
+    def stats(self):
+        with self._lock:
+            refreshing = len(self._refreshing)
+        return {**self.store.stats(), "refreshing": refreshing}
+
+
+def get_scrape_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ScrapeCache()
+    return _cache
@@ -0,0 +1,85 @@
+from collections import Counter
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # optional backend — needs numpy + scipy
+    np = sparse = None
+
+DEFAULT_NGRAM_RANGE = (2, 4)
+DEFAULT_THRESHOLD = 0.6
+# Upper bound on similarity entries materialised per chunk of rows
+CHUNK_CELLS = 4_000_000
+
+
+def char_ngrams(text, ngram_range=DEFAULT_NGRAM_RANGE):
+    padded = f" {text} "
+    low, high = ngram_range
+    for n in range(low, high + 1):
+        for i in range(len(padded) - n + 1):
+            yield padded[i:i + n]
+
+
+def tfidf_vectors(texts, ngram_range=DEFAULT_NGRAM_RANGE, max_df=0.5):
+    """
+    L2-normalised TF-IDF rows over character n-grams (CSR, float32).
+    N-grams present in more than `max_df` of the texts carry almost no signal
+    and would densify the similarity product, so they are dropped.
+    """
+    vocab = {}
+    rows, cols, counts = [], [], []
+    for i, text in enumerate(texts):
+        for gram, count in Counter(char_ngrams(text, ngram_range)).items():
+            rows.append(i)
+            cols.append(vocab.setdefault(gram, len(vocab)))
+            counts.append(count)
+
+    n_docs = len(texts)
+    matrix = sparse.csr_matrix(
+        (np.asarray(counts, dtype=np.float32), (rows, cols)),
+        shape=(n_docs, len(vocab)),
+    )
+
+    df = np.bincount(matrix.indices, minlength=len(vocab))
+    idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+    if n_docs > 2:
+        idf[df > max_df * n_docs] = 0
+
+    matrix.data = 1 + np.log(matrix.data)
+    matrix = matrix @ sparse.diags(idf)
+
+    norms = np.sqrt(matrix.multiply(matrix).sum(axis=1)).A1
+    norms[norms == 0] = 1
+    return sparse.csr_matrix(sparse.diags(1 / norms) @ matrix, dtype=np.float32)
+
+
+def cross_site_neighbours(vectors, sources, threshold):
+    """
+    {i: [(j, score), ...]} for every j > i from a different site with cosine
+    similarity above `threshold`, computed in row chunks of one sparse product.
+    """
+    sources = np.asarray(sources)
+    neighbours = {}
+    n = vectors.shape[0]
+    transposed = vectors.T.tocsc()
+    chunk = max(CHUNK_CELLS // max(n, 1), 64)
+
+    for start in range(0, n, chunk):
+        block = (vectors[start:start + chunk] @ transposed).tocoo()
+        rows = block.row + start
+        keep = (block.data > threshold) & (block.col > rows) & (sources[rows] != sources[block.col])
+        for i, j, score in zip(rows[keep], block.col[keep], block.data[keep]):
+            neighbours.setdefault(int(i), []).append((int(j), float(score)))
+
+    return neighbours
+
+
+def match_tfidf(all_products, threshold=DEFAULT_THRESHOLD, ngram_range=DEFAULT_NGRAM_RANGE):
+    """Neighbour lists for the greedy grouper in utils.matcher, from TF-IDF cosine similarity."""
+    if sparse is None:
+        raise ImportError("The 'tfidf' matching backend needs numpy and scipy installed.")
+    if not all_products:
+        return {}
+
+    vectors = tfidf_vectors([p.normalized for p in all_products], ngram_range)
+    return cross_site_neighbours(vectors, [p.source for p in all_products], threshold)
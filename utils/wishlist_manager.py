@@ -20,7 +20,7 @@ def save_wishlist(wishlist, username):
 def add_to_wishlist(product, username):
     wishlist = load_wishlist(username)
     if not any(p["link"] == product["link"] for p in wishlist):
-        wishlist.append(product)
+        wishlist.append(product.to_dict() if hasattr(product, "to_dict") else product)
         save_wishlist(wishlist, username)
 
 def remove_from_wishlist(link, username):